@@ -1,5 +1,6 @@
 from dvw.attacks.attacks import (
     Attack,
+    AffineAttack,
     FlipAxis,
     Flip,
     Resize,
@@ -7,8 +8,11 @@ from dvw.attacks.attacks import (
     Fill,
     RotateAngle,
     Rotate,
+    CompositeAffineAttack,
     Gaussian,
     SaltAndPepper,
     attack_video,
+    attack_video_pipelined,
+    attack_video_parallel,
     name2class,
 )
@@ -1,21 +1,30 @@
-from abc import ABC
+import os
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
 from enum import Enum
-from typing import Optional, Type, Dict
+from tempfile import TemporaryDirectory
+from typing import Optional, Type, Dict, Tuple, Iterable, List, Sequence
 
 import cv2
 import numpy as np
 
 from dvw.core.transforms import Transformation
-from dvw.io.video import VideoTunnel, FrameHandler
-from dvw.util import shape2shape
+from dvw.io.video import VideoTunnel, FrameHandler, VideoReader, concat_videos
+from dvw.util import shape2shape, accelerated
 from dvw.util.types import Shape2dParameters, Shape2d
 
 
+_RNG = np.random.default_rng()
+
+
 class Attack(Transformation, FrameHandler, ABC):
     @property
     def shape(self) -> Shape2dParameters:
         return None
 
+    def output_shape(self, shape: Shape2d) -> Shape2d:
+        return shape2shape(shape, self.shape)
+
     def transform(self, domain: np.ndarray, memory: list) -> np.ndarray:
         return self.handle(domain)
 
@@ -23,6 +32,12 @@ class Attack(Transformation, FrameHandler, ABC):
         return domain
 
 
+class AffineAttack(Attack, ABC):
+    @abstractmethod
+    def affine(self, shape: Shape2d) -> np.ndarray:
+        pass
+
+
 class FlipAxis(Enum):
     HORIZONTAL = ("hr", 1)
     VERTICAL = ("vr", 0)
@@ -35,31 +50,54 @@ class FlipAxis(Enum):
         return obj
 
 
-class Flip(Attack):
+class Flip(AffineAttack):
     def __init__(self, axis: FlipAxis) -> None:
         self.axis = axis
 
+    def affine(self, shape: Shape2d) -> np.ndarray:
+        height, width = shape
+        sx = -1 if self.axis.code != 0 else 1
+        sy = -1 if self.axis.code != 1 else 1
+        tx = width - 1 if sx < 0 else 0
+        ty = height - 1 if sy < 0 else 0
+        return np.array([[sx, 0, tx], [0, sy, ty], [0, 0, 1]], dtype=np.float64)
+
     def handle(self, frame: np.ndarray) -> np.ndarray:
-        return cv2.flip(frame, self.axis.code)
+        return accelerated(cv2.flip, frame, self.axis.code)
 
 
-class Resize(Attack):
+class Resize(AffineAttack):
     def __init__(
         self, width: Optional[int] = None, height: Optional[int] = None
     ) -> None:
         self.width = width
         self.height = height
+        self._source_shape: Optional[Shape2d] = None
+        self._size: Optional[Tuple[int, int]] = None
 
     @property
     def shape(self) -> Shape2d:
         return self.height, self.width
 
     def handle(self, frame: np.ndarray) -> np.ndarray:
-        shape = shape2shape(np.shape(frame), (self.height, self.width))
-        return cv2.resize(frame, shape[::-1])
-
-
-class Crop(Attack):
+        source_shape = frame.shape[:2]
+        if source_shape != self._source_shape:
+            shape = shape2shape(source_shape, (self.height, self.width))
+            self._source_shape = source_shape
+            self._size = shape[::-1]
+        return accelerated(cv2.resize, frame, self._size)
+
+    def affine(self, shape: Shape2d) -> np.ndarray:
+        height, width = self.output_shape(shape)
+        sx = width / shape[1]
+        sy = height / shape[0]
+        return np.array(
+            [[sx, 0, 0.5 * (sx - 1)], [0, sy, 0.5 * (sy - 1)], [0, 0, 1]],
+            dtype=np.float64,
+        )
+
+
+class Crop(AffineAttack):
     def __init__(self, y: int, x: int, height: int, width: int) -> None:
         self.y1 = y
         self.y2 = y + height
@@ -70,9 +108,13 @@ class Crop(Attack):
     def shape(self) -> Shape2d:
         return self.y2 - self.y1, self.x2 - self.x1
 
+    def affine(self, shape: Shape2d) -> np.ndarray:
+        return np.array(
+            [[1, 0, -self.x1], [0, 1, -self.y1], [0, 0, 1]], dtype=np.float64
+        )
+
     def handle(self, frame: np.ndarray) -> np.ndarray:
-        frame = np.array(frame)
-        return frame[self.y1 : self.y2, self.x1 : self.x2]
+        return np.ascontiguousarray(frame[self.y1 : self.y2, self.x1 : self.x2])
 
 
 class Fill(Attack):
@@ -84,7 +126,7 @@ class Fill(Attack):
         self.value = value
 
     def handle(self, frame: np.ndarray) -> np.ndarray:
-        frame = np.array(frame)
+        frame = frame.copy()
         frame[self.y1 : self.y2, self.x1 : self.x2] = self.value
         return frame
 
@@ -101,7 +143,7 @@ class RotateAngle(Enum):
         return obj
 
 
-class Rotate(Attack):
+class Rotate(AffineAttack):
     def __init__(self, angle: RotateAngle) -> None:
         self.angle = angle
 
@@ -111,47 +153,163 @@ class Rotate(Attack):
             return -1
         return None
 
+    def affine(self, shape: Shape2d) -> np.ndarray:
+        height, width = shape
+        return _ROTATIONS[self.angle](height - 1, width - 1)
+
     def handle(self, frame: np.ndarray) -> np.ndarray:
-        return cv2.rotate(frame, self.angle.code)
+        return accelerated(cv2.rotate, frame, self.angle.code)
+
+
+class CompositeAffineAttack(Attack):
+    def __init__(self, *attacks: AffineAttack) -> None:
+        self.attacks = attacks
+        self._stages = _split_stages(attacks)
+        self._source_shape: Optional[Shape2d] = None
+        self._warps: List[_Warp] = []
+
+    def output_shape(self, shape: Shape2d) -> Shape2d:
+        for a in self.attacks:
+            shape = a.output_shape(shape)
+        return shape
+
+    def handle(self, frame: np.ndarray) -> np.ndarray:
+        source_shape = frame.shape[:2]
+        if source_shape != self._source_shape:
+            self._source_shape = source_shape
+            self._warps = _compile_stages(self._stages, source_shape)
+        for window, matrix, size in self._warps:
+            frame = frame[window]
+            if matrix is not None:
+                frame = accelerated(
+                    cv2.warpAffine,
+                    frame,
+                    matrix,
+                    size,
+                    flags=cv2.INTER_LINEAR,
+                    borderMode=cv2.BORDER_REPLICATE,
+                )
+        return np.ascontiguousarray(frame)
+
+
+_Stage = Tuple[List[Crop], List[AffineAttack]]
+_Warp = Tuple[Tuple[slice, slice], Optional[np.ndarray], Tuple[int, int]]
+
+
+def _split_stages(attacks: Sequence[AffineAttack]) -> List[_Stage]:
+    # A warp over the whole frame would interpolate across a crop's edges, so
+    # every crop followed by a resize starts a stage that slices it off first.
+    stages: List[_Stage] = [([], [])]
+    for i, a in enumerate(attacks):
+        crops, rest = stages[-1]
+        if not isinstance(a, Crop):
+            rest.append(a)
+        elif not rest:
+            crops.append(a)
+        elif any(isinstance(b, Resize) for b in attacks[i + 1 :]):
+            stages.append(([a], []))
+        else:
+            rest.append(a)
+    return stages
+
+
+def _compile_stages(stages: Iterable[_Stage], shape: Shape2d) -> List[_Warp]:
+    warps = []
+    for crops, rest in stages:
+        y = x = 0
+        for c in crops:
+            y += c.y1
+            x += c.x1
+            shape = c.output_shape(shape)
+        window = slice(y, y + shape[0]), slice(x, x + shape[1])
+        matrix = _compose_affine(rest, shape) if rest else None
+        for a in rest:
+            shape = a.output_shape(shape)
+        warps.append((window, matrix, shape[::-1]))
+    return warps
+
+
+def _compose_affine(attacks: Iterable[AffineAttack], shape: Shape2d) -> np.ndarray:
+    matrix = np.eye(3)
+    for a in attacks:
+        matrix = a.affine(shape) @ matrix
+        shape = a.output_shape(shape)
+    return matrix[:2]
+
+
+_ROTATIONS = {
+    RotateAngle.ROTATE_90_CLOCKWISE: lambda h, w: np.array(
+        [[0, -1, h], [1, 0, 0], [0, 0, 1]], dtype=np.float64
+    ),
+    RotateAngle.ROTATE_180: lambda h, w: np.array(
+        [[-1, 0, w], [0, -1, h], [0, 0, 1]], dtype=np.float64
+    ),
+    RotateAngle.ROTATE_90_COUNTERCLOCKWISE: lambda h, w: np.array(
+        [[0, 1, 0], [-1, 0, w], [0, 0, 1]], dtype=np.float64
+    ),
+}
 
 
 class Gaussian(Attack):
     def __init__(self, std: float = 1, area: float = 1) -> None:
         self.std = std
         self.area = area
+        self._noise_buffer: Optional[np.ndarray] = None
 
     def handle(self, frame: np.ndarray) -> np.ndarray:
-        frame = np.array(frame, dtype=float)
         if self.area >= 1:
-            frame.flat += np.random.normal(0, self.std, frame.size)
-        elif self.area > 0:
-            amount = int(self.area * frame.size)
-            flat_indices = np.random.choice(frame.size, amount, False)
-            frame.flat[flat_indices] += np.random.normal(0, self.std, amount)
-        return frame.clip(0, 255).astype(np.uint8)
+            noise = self._noise(frame.size).reshape(frame.shape)
+            return cv2.add(frame, noise, dtype=cv2.CV_8U)
+        if self.area > 0:
+            frame = frame.copy()
+            flat = frame.reshape(-1)
+            amount = int(self.area * flat.size)
+            flat_indices = _RNG.integers(0, flat.size, amount)
+            noise = self._noise(amount)
+            noisy = cv2.add(flat[flat_indices], noise, dtype=cv2.CV_8U)
+            flat[flat_indices] = noisy.ravel()
+        return frame
+
+    def _noise(self, size: int) -> np.ndarray:
+        if self._noise_buffer is None or self._noise_buffer.size != size:
+            self._noise_buffer = np.empty(size, dtype=np.int16)
+        _seed_cv2_rng()
+        cv2.randn(self._noise_buffer, 0, self.std)
+        return self._noise_buffer
 
 
 class SaltAndPepper(Attack):
     def __init__(self, area: float = 1) -> None:
         self.area = area
+        self._mask_buffer: Optional[np.ndarray] = None
 
     def handle(self, frame: np.ndarray) -> np.ndarray:
         frame = frame.copy()
         height, width = frame.shape[:2]
-        total = height * width
-        amount = int(self.area * total)
+        pixels = frame.reshape(height * width, -1)
+        mask = self._mask((height, width)).reshape(-1)
 
-        flat_idx = np.random.choice(total, amount, False)
-        flat_salt = flat_idx[: len(flat_idx) // 2]
-        flat_pepper = flat_idx[len(flat_idx) // 2 :]
+        indices = np.flatnonzero(mask < self.area)
+        salt = mask[indices] < self.area / 2
+        pixels[indices] = np.where(salt, 255, 0).astype(np.uint8)[:, np.newaxis]
 
-        salt = np.unravel_index(flat_salt, (height, width))
-        pepper = np.unravel_index(flat_pepper, (height, width))
+        return frame
 
-        frame[salt] = 255
-        frame[pepper] = 0
+    def _mask(self, shape: Shape2d) -> np.ndarray:
+        if self._mask_buffer is None or self._mask_buffer.shape != shape:
+            self._mask_buffer = np.empty(shape, dtype=np.float32)
+        _seed_cv2_rng()
+        cv2.randu(self._mask_buffer, 0, 1)
+        return self._mask_buffer
+
+
+def _seed_cv2_rng() -> None:
+    cv2.setRNGSeed(int(_RNG.integers(2 ** 31)))
 
-        return frame
+
+def _reseed(seed: int) -> None:
+    global _RNG
+    _RNG = np.random.default_rng(seed)
 
 
 def attack_video(
@@ -161,10 +319,91 @@ def attack_video(
     codec: str = "mp4v",
     fps: Optional[int] = None,
 ) -> None:
-    with VideoTunnel(input_path, output_path, codec, fps, attack.shape) as video_tunnel:
+    with VideoTunnel(
+        input_path, output_path, codec, fps, attack.output_shape
+    ) as video_tunnel:
         video_tunnel.transfer_all(attack)
 
 
+def attack_video_pipelined(
+    attack: Attack,
+    input_path: str,
+    output_path: str,
+    codec: str = "mp4v",
+    fps: Optional[int] = None,
+    prefetch: int = 8,
+) -> None:
+    with VideoTunnel(
+        input_path, output_path, codec, fps, attack.output_shape, prefetch
+    ) as video_tunnel:
+        video_tunnel.transfer_all(attack)
+
+
+def attack_video_parallel(
+    attack: Attack,
+    input_path: str,
+    output_path: str,
+    codec: str = "mp4v",
+    fps: Optional[int] = None,
+    workers: Optional[int] = None,
+) -> None:
+    workers = workers or os.cpu_count() or 1
+    with VideoReader(input_path) as video_reader:
+        frames = video_reader.frames
+    if workers == 1 or frames <= 0:
+        attack_video(attack, input_path, output_path, codec, fps)
+        return
+
+    step = -(-frames // workers)
+    starts = range(0, frames, step)
+    seeds = np.random.SeedSequence().generate_state(len(starts))
+
+    with TemporaryDirectory() as tmp, ProcessPoolExecutor(workers) as executor:
+        _, extension = os.path.splitext(output_path)
+        segments = []
+        futures = []
+        for i, start in enumerate(starts):
+            # The frame count is only an estimate, so the last segment reads to EOF.
+            stop = start + step if i < len(starts) - 1 else None
+            segment_path = os.path.join(tmp, f"segment{i}{extension}")
+            segments.append(segment_path)
+            futures.append(
+                executor.submit(
+                    _attack_video_range,
+                    attack,
+                    input_path,
+                    segment_path,
+                    codec,
+                    fps,
+                    start,
+                    stop,
+                    int(seeds[i]),
+                )
+            )
+        for f in futures:
+            f.result()
+
+        concat_videos(segments, output_path)
+
+
+def _attack_video_range(
+    attack: Attack,
+    input_path: str,
+    output_path: str,
+    codec: str,
+    fps: Optional[int],
+    start: int,
+    stop: Optional[int],
+    seed: Optional[int] = None,
+) -> None:
+    if seed is not None:
+        _reseed(seed)
+    with VideoTunnel(
+        input_path, output_path, codec, fps, attack.output_shape
+    ) as video_tunnel:
+        video_tunnel.transfer_range(attack, start, stop)
+
+
 def name2class(name: str) -> Type[Attack]:
     return _ATTACKS.get(name)
 
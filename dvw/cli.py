@@ -2,7 +2,7 @@ import click
 
 from dvw.attacks.commands import attack
 
-from dvw.core.commands import embed, extract
+from dvw.core.commands import embed, extract, embed_batch, extract_batch
 from dvw.metrics.commands import metric
 from dvw.probe.commands import probe
 from dvw.report.commands import report
@@ -16,6 +16,8 @@ def main():
 
 main.add_command(embed)
 main.add_command(extract)
+main.add_command(embed_batch)
+main.add_command(extract_batch)
 main.add_command(attack)
 main.add_command(metric)
 main.add_command(probe)
@@ -1,5 +1,11 @@
+import os
 from abc import ABC
-from typing import Type, Dict, Iterable, Optional
+from concurrent.futures import ProcessPoolExecutor
+from tempfile import TemporaryDirectory
+from time import time
+from typing import Type, Dict, Iterable, Optional, Sequence
+
+import numpy as np
 
 from dvw.core import (
     WatermarkEmbedder,
@@ -26,15 +32,34 @@ from dvw.core.transforms import (
     WaveletSubband,
     Transformation,
     Pipe,
+    Precision,
+)
+from dvw.io.video import (
+    create_video_reader,
+    VideoReader,
+    VideoTunnel,
+    HardwareAcceleration,
+    concat_videos,
 )
-from dvw.io.video import VideoReader
-from dvw.io.watermark import WatermarkBitReader, WatermarkBitWriter
+from dvw.io.watermark import (
+    WatermarkBitReader,
+    WatermarkBitWriter,
+    BitSequenceReader,
+    ConstantBitReader,
+)
+from dvw.util.types import FramePairHandler
 
 
 class Algorithm(ABC):
-    def __init__(self, transformation: Transformation, method: Method) -> None:
+    def __init__(
+        self,
+        transformation: Transformation,
+        method: Method,
+        extracting_transformation: Optional[Transformation] = None,
+    ) -> None:
         self.transformation = transformation
         self.method = method
+        self.extracting_transformation = extracting_transformation or transformation
 
     def embed(
         self,
@@ -42,12 +67,110 @@ class Algorithm(ABC):
         output_path: str,
         watermark_reader: WatermarkBitReader,
         codec: str = "mp4v",
+        on_frame_pair: Optional[FramePairHandler] = None,
+        prefetch: int = 8,
+        hwaccel: Optional[HardwareAcceleration] = None,
     ) -> EmbeddingStatistics:
         embedding_suite = FrameEmbeddingKit(
             self.transformation, self.method, watermark_reader
         )
-        with WatermarkEmbedder(input_path, output_path, codec) as embedder:
-            return embedder.embed(embedding_suite)
+        with WatermarkEmbedder(
+            input_path, output_path, codec, prefetch, hwaccel
+        ) as embedder:
+            return embedder.embed(embedding_suite, on_frame_pair=on_frame_pair)
+
+    def embed_parallel(
+        self,
+        input_path: str,
+        output_path: str,
+        watermark_reader: WatermarkBitReader,
+        codec: str = "mp4v",
+        workers: Optional[int] = None,
+        prefetch: int = 8,
+    ) -> EmbeddingStatistics:
+        workers = workers or os.cpu_count() or 1
+        with VideoReader(input_path) as video_reader:
+            frames = video_reader.frames
+            success, frame = video_reader.read()
+
+        capacity = self._frame_capacity(frame) if success else 0
+        if workers == 1 or not capacity or frames <= 0:
+            return self.embed(
+                input_path, output_path, watermark_reader, codec, prefetch=prefetch
+            )
+
+        # The frame count is only an estimate, so the last range is embedded here
+        # straight from the watermark reader and runs to EOF like embed() does.
+        start_time = time()
+        step = -(-frames // workers)
+        tail = range(0, frames, step)[-1]
+        bits = _read_bits(watermark_reader, capacity * tail)
+        embedding_frames = -(-bits.size // capacity)
+        exhausted = bits.size < capacity * tail
+        if exhausted:
+            step = max(-(-embedding_frames // workers), 1)
+
+        with TemporaryDirectory() as tmp, ProcessPoolExecutor(workers) as executor:
+            _, extension = os.path.splitext(output_path)
+            segments = []
+            futures = []
+            for start in range(0, embedding_frames, step):
+                stop = min(start + step, embedding_frames)
+                segment_path = os.path.join(tmp, f"segment{start}{extension}")
+                segments.append(segment_path)
+                futures.append(
+                    executor.submit(
+                        _embed_range,
+                        self,
+                        input_path,
+                        segment_path,
+                        codec,
+                        bits[start * capacity : stop * capacity],
+                        start,
+                        stop,
+                        prefetch,
+                    )
+                )
+
+            segment_path = os.path.join(tmp, f"segment{embedding_frames}{extension}")
+            segments.append(segment_path)
+            if exhausted:
+                copied = executor.submit(
+                    _copy_range,
+                    input_path,
+                    segment_path,
+                    codec,
+                    embedding_frames,
+                    prefetch,
+                ).result()
+                statistics = EmbeddingStatistics(
+                    embedding_frames + copied, int(bits.size), copied
+                )
+            else:
+                embedding_kit = FrameEmbeddingKit(
+                    self.transformation, self.method, watermark_reader
+                )
+                with WatermarkEmbedder(
+                    input_path, segment_path, codec, prefetch
+                ) as embedder:
+                    embedder.reader.seek(embedding_frames)
+                    statistics = embedder.embed(embedding_kit)
+                    statistics.total_frames = embedder.position
+                statistics.embedded += int(bits.size)
+
+            for f in futures:
+                f.result()
+
+            concat_videos(segments, output_path)
+
+        statistics.full_watermark = not watermark_reader.available()
+        statistics.start_time = start_time
+        statistics.end_time = time()
+        return statistics
+
+    def _frame_capacity(self, frame: np.ndarray) -> int:
+        domain = self.transformation.transform(frame, [])
+        return self.method.embed(domain, ConstantBitReader(0))[1]
 
     def extract(
         self,
@@ -55,13 +178,15 @@ class Algorithm(ABC):
         watermark_writer: WatermarkBitWriter,
         quantity: int,
         preparer: Optional[Transformation] = None,
+        prefetch: int = 8,
+        hwaccel: Optional[HardwareAcceleration] = None,
     ) -> ExtractingStatistics:
-        transformation = self.transformation
+        transformation = self.extracting_transformation
         if preparer:
             transformation = Pipe(preparer, transformation)
 
         extractor = BlindWatermarkExtractor(transformation, self.method)
-        with VideoReader(input_path) as video_reader:
+        with create_video_reader(input_path, prefetch, hwaccel) as video_reader:
             return extractor.extract(video_reader, watermark_writer, quantity)
 
 
@@ -74,11 +199,14 @@ class DwtWindowMedian(Algorithm):
         position: WindowPosition,
         window_size: int,
         emphasis: Emphasis,
+        precision: Precision = Precision.F64,
     ):
         bit_manipulator = WindowMedianBitManipulator()
         submethod = emphasis.create(bit_manipulator)
         method = WindowMedian(window_size, submethod)
-        transformation = frame2dwt_stack(wavelet, level, position, *subbands)
+        transformation = frame2dwt_stack(
+            wavelet, level, position, *subbands, precision=precision
+        )
         super().__init__(transformation, method)
 
 
@@ -93,11 +221,12 @@ class DwtDctEvenOddDifferential(Algorithm):
         repeats: int,
         alpha: float,
         emphasis: Emphasis,
+        precision: Precision = Precision.F64,
     ):
         bit_manipulator = EvenOddDifferentialBitManipulator(alpha)
         submethod = emphasis.create(bit_manipulator)
         method = EvenOddDifferential(offset, area, repeats, submethod)
-        transformation = frame2dwt_dct(wavelet, level, *subbands)
+        transformation = frame2dwt_dct(wavelet, level, *subbands, precision=precision)
         super().__init__(transformation, method)
 
 
@@ -110,12 +239,45 @@ class DwtSvdMeanOverWindowEdges(Algorithm):
         window_size: int,
         alpha: float,
         emphasis: Emphasis,
+        precision: Precision = Precision.F64,
     ):
         bit_manipulator = MeanOverWindowEdgesBitManipulator(alpha)
         submethod = emphasis.create(bit_manipulator)
         method = MeanOverWindowEdges(window_size, submethod)
-        transformation = frame2dwt_svd(wavelet, level, *subbands)
-        super().__init__(transformation, method)
+        transformation = frame2dwt_svd(wavelet, level, *subbands, precision=precision)
+        extracting_transformation = frame2dwt_svd(
+            wavelet, level, *subbands, compute_uv=False, precision=precision
+        )
+        super().__init__(transformation, method, extracting_transformation)
+
+
+def _read_bits(watermark_reader: WatermarkBitReader, limit: int) -> np.ndarray:
+    return np.asarray(watermark_reader.read_block(limit), dtype=np.uint8)
+
+
+def _embed_range(
+    algorithm: Algorithm,
+    input_path: str,
+    output_path: str,
+    codec: str,
+    bits: Sequence[int],
+    start: int,
+    stop: int,
+    prefetch: int = 0,
+) -> None:
+    embedding_kit = FrameEmbeddingKit(
+        algorithm.transformation, algorithm.method, BitSequenceReader(bits)
+    )
+    with VideoTunnel(input_path, output_path, codec, prefetch=prefetch) as video_tunnel:
+        video_tunnel.transfer_range(embedding_kit, start, stop)
+
+
+def _copy_range(
+    input_path: str, output_path: str, codec: str, start: int, prefetch: int = 0
+) -> int:
+    with VideoTunnel(input_path, output_path, codec, prefetch=prefetch) as video_tunnel:
+        video_tunnel.reader.seek(start)
+        return video_tunnel.copy_frames()
 
 
 def name2class(name: str) -> Type[Algorithm]:
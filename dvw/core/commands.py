@@ -1,9 +1,11 @@
-from typing import Iterable, Any, Dict, List, Type
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Any, Dict, List, Type, Callable, Optional
 
 import click
 from click import IntRange, Choice, FloatRange, Context, Option
 from pywt import wavelist
 
+from dvw.core import EmbeddingStatistics, ExtractingStatistics
 from dvw.core.algorithms import (
     DwtWindowMedian,
     Algorithm,
@@ -11,9 +13,11 @@ from dvw.core.algorithms import (
     DwtSvdMeanOverWindowEdges,
 )
 from dvw.core.methods import WindowPosition, Emphasis
-from dvw.core.transforms import WaveletSubband
+from dvw.core.transforms import WaveletSubband, Precision
+from dvw.io.video import HardwareAcceleration
 from dvw.io.watermark import WatermarkType
 from dvw.ui.terminal import print_properties
+from dvw.util.util import load_json
 from dvw.util.click import (
     EnumType,
     add_options,
@@ -46,6 +50,12 @@ _WAVELET_OPTIONS: List[Type[Option]] = [
         default="capacity",
         help="Watermark embedding emphasis",
     ),
+    click.option(
+        "--precision",
+        type=EnumType(Precision),
+        default="f64",
+        help="Floating point precision of wavelet coefficients",
+    ),
 ]
 
 
@@ -88,6 +98,18 @@ _WAVELET_OPTIONS: List[Type[Option]] = [
     type=IntRange(min=0),
     help="New watermark width (relevant for bw-image type)",
 )
+@click.option(
+    "-c",
+    "--codec",
+    default="mp4v",
+    help="Output codec: OpenCV fourcc or FFmpeg encoder (e.g. h264_nvenc)",
+)
+@click.option(
+    "--hwaccel",
+    type=EnumType(HardwareAcceleration),
+    default="none",
+    help="Hardware accelerated decoding of input video",
+)
 @click.pass_context
 def embed(ctx: Context) -> None:
     update_context(ctx, handler=_embed)
@@ -99,11 +121,37 @@ def _embed(
     output_path: str,
     watermark_path: str,
     watermark_type: WatermarkType,
+    codec: str = "mp4v",
+    hwaccel: HardwareAcceleration = HardwareAcceleration.NONE,
     **kwargs
 ) -> None:
+    statistics = _embed_job(
+        algorithm,
+        input_path,
+        output_path,
+        watermark_path,
+        watermark_type,
+        codec,
+        hwaccel,
+        **kwargs
+    )
+    print_properties(statistics, algorithm.__class__.__name__)
+
+
+def _embed_job(
+    algorithm: Algorithm,
+    input_path: str,
+    output_path: str,
+    watermark_path: str,
+    watermark_type: WatermarkType,
+    codec: str = "mp4v",
+    hwaccel: HardwareAcceleration = HardwareAcceleration.NONE,
+    **kwargs
+) -> EmbeddingStatistics:
     with watermark_type.reader(watermark_path, **kwargs) as watermark_reader:
-        statistics = algorithm.embed(input_path, output_path, watermark_reader)
-        print_properties(statistics, algorithm.__class__.__name__)
+        return algorithm.embed(
+            input_path, output_path, watermark_reader, codec, hwaccel=hwaccel
+        )
 
 
 @click.group(help="Blind extracting watermark", cls=TransparentGroup)
@@ -140,6 +188,12 @@ def _embed(
 @click.option(
     "-q", "--quantity", required=True, type=int, help="Number of extraction bits"
 )
+@click.option(
+    "--hwaccel",
+    type=EnumType(HardwareAcceleration),
+    default="none",
+    help="Hardware accelerated decoding of input video",
+)
 @click.pass_context
 def extract(ctx: Context) -> None:
     update_context(ctx, handler=_extract)
@@ -151,11 +205,118 @@ def _extract(
     watermark_path: str,
     watermark_type: WatermarkType,
     quantity: int,
+    hwaccel: HardwareAcceleration = HardwareAcceleration.NONE,
     **kwargs
 ) -> None:
+    statistics = _extract_job(
+        algorithm,
+        input_path,
+        watermark_path,
+        watermark_type,
+        quantity,
+        hwaccel,
+        **kwargs
+    )
+    print_properties(statistics, algorithm.__class__.__name__)
+
+
+def _extract_job(
+    algorithm: Algorithm,
+    input_path: str,
+    watermark_path: str,
+    watermark_type: WatermarkType,
+    quantity: int,
+    hwaccel: HardwareAcceleration = HardwareAcceleration.NONE,
+    **kwargs
+) -> ExtractingStatistics:
     with watermark_type.writer(watermark_path, **kwargs) as watermark_writer:
-        statistics = algorithm.extract(input_path, watermark_writer, quantity)
-        print_properties(statistics, algorithm.__class__.__name__)
+        return algorithm.extract(
+            input_path, watermark_writer, quantity, hwaccel=hwaccel
+        )
+
+
+@click.group(help="Embedding watermark into many videos", cls=TransparentGroup)
+@click.option(
+    "-j",
+    "--jobs",
+    "jobs_path",
+    required=True,
+    type=click.Path(exists=True),
+    help="JSON file with a list of jobs (input, output, watermark, type, width, codec)",
+)
+@click.option(
+    "--workers",
+    type=IntRange(min=1),
+    default=1,
+    help="Number of videos processed in parallel",
+)
+@click.pass_context
+def embed_batch(ctx: Context) -> None:
+    update_context(ctx, handler=_embed_batch)
+
+
+def _embed_batch(algorithm: Algorithm, jobs_path: str, workers: int = 1) -> None:
+    jobs = [
+        (
+            algorithm,
+            job.pop("input"),
+            job.pop("output"),
+            job.pop("watermark"),
+            WatermarkType(job.pop("type")),
+            job,
+        )
+        for job in load_json(jobs_path)
+    ]
+    _run_jobs(_embed_job, jobs, workers, algorithm.__class__.__name__)
+
+
+@click.group(help="Blind extracting watermark from many videos", cls=TransparentGroup)
+@click.option(
+    "-j",
+    "--jobs",
+    "jobs_path",
+    required=True,
+    type=click.Path(exists=True),
+    help="JSON file with a list of jobs (input, output, type, quantity, width)",
+)
+@click.option(
+    "--workers",
+    type=IntRange(min=1),
+    default=1,
+    help="Number of videos processed in parallel",
+)
+@click.pass_context
+def extract_batch(ctx: Context) -> None:
+    update_context(ctx, handler=_extract_batch)
+
+
+def _extract_batch(algorithm: Algorithm, jobs_path: str, workers: int = 1) -> None:
+    jobs = [
+        (
+            algorithm,
+            job.pop("input"),
+            job.pop("output"),
+            WatermarkType(job.pop("type")),
+            job.pop("quantity"),
+            job,
+        )
+        for job in load_json(jobs_path)
+    ]
+    _run_jobs(_extract_job, jobs, workers, algorithm.__class__.__name__)
+
+
+def _run_jobs(
+    handler: Callable, jobs: List[tuple], workers: Optional[int], title: str
+) -> None:
+    if workers == 1 or len(jobs) < 2:
+        for *args, kwargs in jobs:
+            print_properties(handler(*args, **kwargs), title)
+        return
+
+    with ProcessPoolExecutor(workers) as executor:
+        futures = [executor.submit(handler, *args, **kwargs) for *args, kwargs in jobs]
+        for f in futures:
+            print_properties(f.result(), title)
 
 
 @click.command(
@@ -179,10 +340,11 @@ def dwt_window_median(
     position: WindowPosition,
     window_size: int,
     emphasis: Emphasis,
+    precision: Precision,
     **kwargs
 ) -> None:
     algorithm = DwtWindowMedian(
-        wavelet, level, subbands, position, window_size, emphasis
+        wavelet, level, subbands, position, window_size, emphasis, precision
     )
     group_args.pop("handler")(algorithm, **kwargs)
 
@@ -219,10 +381,11 @@ def dwt_dct_even_odd_differential(
     repeats: int,
     alpha: float,
     emphasis: Emphasis,
+    precision: Precision,
     **kwargs
 ) -> None:
     algorithm = DwtDctEvenOddDifferential(
-        wavelet, level, subbands, offset, area, repeats, alpha, emphasis
+        wavelet, level, subbands, offset, area, repeats, alpha, emphasis, precision
     )
     group_args.pop("handler")(algorithm, **kwargs)
 
@@ -243,19 +406,16 @@ def dwt_svd_mean_over_window_edges(
     window_size: int,
     alpha: float,
     emphasis: Emphasis,
+    precision: Precision,
     **kwargs
 ) -> None:
     algorithm = DwtSvdMeanOverWindowEdges(
-        wavelet, level, subbands, window_size, alpha, emphasis
+        wavelet, level, subbands, window_size, alpha, emphasis, precision
     )
     group_args.pop("handler")(algorithm, **kwargs)
 
 
-embed.add_command(dwt_window_median)
-extract.add_command(dwt_window_median)
-
-embed.add_command(dwt_dct_even_odd_differential)
-extract.add_command(dwt_dct_even_odd_differential)
-
-embed.add_command(dwt_svd_mean_over_window_edges)
-extract.add_command(dwt_svd_mean_over_window_edges)
+for group in (embed, extract, embed_batch, extract_batch):
+    group.add_command(dwt_window_median)
+    group.add_command(dwt_dct_even_odd_differential)
+    group.add_command(dwt_svd_mean_over_window_edges)
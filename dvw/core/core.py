@@ -1,15 +1,21 @@
 from dataclasses import dataclass
 from enum import Enum, auto
 from time import time
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Tuple, Optional
 
 import numpy as np
 
 from dvw.core.methods import Method
 from dvw.core.transforms import Transformation
-from dvw.io.video import FrameHandler, VideoReader, VideoTunnel
+from dvw.io.video import (
+    FrameHandler,
+    VideoReader,
+    VideoTunnel,
+    HardwareAcceleration,
+)
 from dvw.io.watermark import WatermarkBitReader, WatermarkBitWriter
 from dvw.util.base import Observable, CloneableDataclass, PrettyDictionary
+from dvw.util.types import FramePairHandler
 from dvw.util.unit import size2human, timestamp2human, seconds2human
 
 
@@ -73,30 +79,42 @@ class FrameEmbeddingKit(FrameHandler):
 
 
 class WatermarkEmbedder(VideoTunnel):
-    def __init__(self, input_path: str, output_path: str, codec: str) -> None:
-        super().__init__(input_path, output_path, codec)
+    def __init__(
+        self,
+        input_path: str,
+        output_path: str,
+        codec: str,
+        prefetch: int = 0,
+        hwaccel: Optional[HardwareAcceleration] = None,
+    ) -> None:
+        super().__init__(
+            input_path, output_path, codec, prefetch=prefetch, hwaccel=hwaccel
+        )
         self.statistics = EmbeddingStatistics(self.frames)
 
     def embed(
-        self, embedding_kit: FrameEmbeddingKit, copy: bool = True
+        self,
+        embedding_kit: FrameEmbeddingKit,
+        copy: bool = True,
+        on_frame_pair: Optional[FramePairHandler] = None,
     ) -> EmbeddingStatistics:
         self.notify(EmbedEvent.AFTER_EMBEDDING)
         self.statistics.start_time = time()
 
         if not embedding_kit.workable():
             if copy:
-                self.statistics.copied = self.copy_frames()
+                self.statistics.copied = self.copy_frames(on_frame_pair)
             return self.statistics
 
         success = True
         while success and embedding_kit.workable():
             self._notify_embedding(EmbedEvent.BEFORE_FRAME_EMBEDDING)
-            success, *result = self.transfer(embedding_kit)
+            success, *result = self.transfer(embedding_kit, on_frame_pair)
             self.statistics.embedded += success and result[1]
             self._notify_embedding(EmbedEvent.AFTER_FRAME_EMBEDDING)
 
         if copy:
-            self.statistics.copied = self.copy_frames()
+            self.statistics.copied = self.copy_frames(on_frame_pair)
 
         self.statistics.end_time = time()
         self.statistics.full_watermark = not embedding_kit.workable()
@@ -107,6 +125,8 @@ class WatermarkEmbedder(VideoTunnel):
         return self.statistics
 
     def _notify_embedding(self, event) -> None:
+        if not self.subscribed(event):
+            return
         self.notify(
             event,
             position=self.position,
@@ -192,4 +212,6 @@ class BlindWatermarkExtractor(Observable):
         return self.method.extract(domain, watermark_writer, quantity)
 
     def _notify_extracting(self, event, statistics: ExtractingStatistics) -> None:
+        if not self.subscribed(event):
+            return
         self.notify(event, total=statistics.total, position=statistics.extracted)
@@ -1,11 +1,10 @@
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import Callable, Tuple
+from typing import Callable, Tuple, Sequence
 
 import numpy as np
 
 from dvw.io.watermark import WatermarkBitReader, WatermarkBitWriter
-from dvw.util import bit2sign
 
 
 class Method(ABC):
@@ -24,6 +23,33 @@ class Method(ABC):
     ) -> int:
         pass
 
+    def embed_many(
+        self, domains: np.ndarray, watermark_reader: WatermarkBitReader
+    ) -> Tuple[np.ndarray, int]:
+        embedded = 0
+
+        for d in domains:
+            if not watermark_reader.available():
+                break
+            _, amount = self.embed(d, watermark_reader)
+            embedded += amount
+
+        return domains, embedded
+
+    def extract_many(
+        self, domains: np.ndarray, watermark_writer: WatermarkBitWriter, quantity: int
+    ) -> int:
+        extracted = 0
+
+        for d in domains:
+            if quantity < 1:
+                break
+            amount = self.extract(d, watermark_writer, quantity)
+            extracted += amount
+            quantity -= amount
+
+        return extracted
+
 
 class BitManipulator(ABC):
     @abstractmethod
@@ -34,6 +60,14 @@ class BitManipulator(ABC):
     def extract(self, domain: np.ndarray) -> int:
         pass
 
+    def embed_many(self, domains: np.ndarray, bits: Sequence[int]) -> np.ndarray:
+        for d, bit in zip(domains, bits):
+            self.embed(d, bit)
+        return domains
+
+    def extract_many(self, domains: np.ndarray) -> np.ndarray:
+        return np.asarray([self.extract(d) for d in domains], dtype=int)
+
 
 class WindowPosition(Enum):
     HORIZONTAL = "hr"
@@ -48,56 +82,61 @@ class WindowMedian(Method):
     def embed(
         self, domain: np.ndarray, watermark_reader: WatermarkBitReader
     ) -> Tuple[np.ndarray, int]:
-        embedded = 0
         domain = np.asarray(domain)
+        windows = self._windows(domain)
+        batch = windows.reshape(-1, *windows.shape[2:])
 
-        for r in domain:
-            for j in range(0, len(r) - (self.window_size - 1), self.window_size):
-                if not watermark_reader.available():
-                    return domain, embedded
-                window = r[j : j + self.window_size].T
-                window, amount = self.submethod.embed(window, watermark_reader)
-                embedded += amount
+        batch, embedded = self.submethod.embed_many(batch, watermark_reader)
+        windows[...] = batch.reshape(windows.shape)
 
         return domain, embedded
 
     def extract(
         self, domain: np.ndarray, watermark_writer: WatermarkBitWriter, quantity: int
     ) -> int:
-        extracted = 0
+        if quantity < 1:
+            return 0
+        windows = self._windows(np.asarray(domain))
+        batch = windows.reshape(-1, *windows.shape[2:])
+        return self.submethod.extract_many(batch, watermark_writer, quantity)
 
-        for r in domain:
-            for j in range(0, len(r) - (self.window_size - 1), self.window_size):
-                if quantity < 1:
-                    return extracted
-                window = np.transpose(r[j : j + self.window_size])
-                amount = self.submethod.extract(window, watermark_writer, quantity)
-                extracted += amount
-                quantity -= amount
-
-        return extracted
+    def _windows(self, domain: np.ndarray) -> np.ndarray:
+        rows, columns, depth = domain.shape
+        count = columns // self.window_size
+        windows = domain[:, : count * self.window_size]
+        windows = windows.reshape(rows, count, self.window_size, depth)
+        return windows.transpose(0, 1, 3, 2)
 
 
 class WindowMedianBitManipulator(BitManipulator):
     def embed(self, window: np.ndarray, bit: int) -> np.ndarray:
-        imin, imax = window.argmin(), window.argmax()
-
-        for i in range(len(window)):
-            if i != imin and i != imax:
-                window[i] = window[imax] if bit else window[imin]
-
+        self.embed_many(window[np.newaxis], [bit])
         return window
 
     def extract(self, window: np.ndarray) -> int:
-        cnt = 0
-        imin, imax = window.argmin(), window.argmax()
+        return int(self.extract_many(window[np.newaxis])[0])
 
-        for i, x in enumerate(window):
-            if i != imin and i != imax:
-                mid = (window[imin] + window[imax]) / 2
-                cnt += bit2sign(x >= mid)
+    def embed_many(self, windows: np.ndarray, bits: Sequence[int]) -> np.ndarray:
+        rows = np.arange(len(windows))
+        imin, imax = windows.argmin(axis=1), windows.argmax(axis=1)
+        low, high = windows[rows, imin], windows[rows, imax]
 
-        return int(cnt >= 0)
+        windows[...] = np.where(bits, high, low)[:, np.newaxis]
+        windows[rows, imin] = low
+        windows[rows, imax] = high
+
+        return windows
+
+    def extract_many(self, windows: np.ndarray) -> np.ndarray:
+        rows = np.arange(len(windows))
+        imin, imax = windows.argmin(axis=1), windows.argmax(axis=1)
+        mid = (windows[rows, imin] + windows[rows, imax]) / 2
+
+        signs = np.where(windows >= mid[:, np.newaxis], 1, -1)
+        cnt = signs.sum(axis=1) - signs[rows, imin]
+        cnt -= np.where(imin != imax, signs[rows, imax], 0)
+
+        return (cnt >= 0).astype(int)
 
 
 class EvenOddDifferential(Method):
@@ -112,35 +151,25 @@ class EvenOddDifferential(Method):
     def embed(
         self, domain: np.ndarray, watermark_reader: WatermarkBitReader
     ) -> Tuple[np.ndarray, int]:
-        embedded = 0
         domain = np.asarray(domain)
-        start, end = self._find_boundaries(domain[0])
-
-        for i in range(start, end - (self.repeats - 1), self.repeats):
-            if not watermark_reader.available():
-                break
-            windows = domain[:, :, i : i + self.repeats]
-            windows, amount = self.submethod.embed(windows, watermark_reader)
-            embedded += amount
-
+        windows = self._windows(domain)
+        _, embedded = self.submethod.embed_many(windows, watermark_reader)
         return domain, embedded
 
     def extract(
         self, domain: np.ndarray, watermark_writer: WatermarkBitWriter, quantity: int
     ) -> int:
-        extracted = 0
-        domain = np.asarray(domain)
-        start, end = self._find_boundaries(domain[0])
-
-        for i in range(start, end - (self.repeats - 1), self.repeats):
-            if quantity < 1:
-                break
-            windows = domain[:, :, i : i + self.repeats]
-            amount = self.submethod.extract(windows, watermark_writer, quantity)
-            extracted += amount
-            quantity -= amount
+        if quantity < 1:
+            return 0
+        windows = self._windows(np.asarray(domain))
+        return self.submethod.extract_many(windows, watermark_writer, quantity)
 
-        return extracted
+    def _windows(self, domain: np.ndarray) -> np.ndarray:
+        start, end = self._find_boundaries(domain[0])
+        count = max(end - start, 0) // self.repeats
+        windows = domain[:, :, start : start + count * self.repeats]
+        windows = windows.reshape(*domain.shape[:2], count, self.repeats)
+        return windows.transpose(2, 0, 1, 3)
 
     def _find_boundaries(self, domain: np.ndarray) -> Tuple[int, int]:
         even, odd = domain
@@ -155,24 +184,24 @@ class EvenOddDifferentialBitManipulator(BitManipulator):
         self.alpha = alpha
 
     def embed(self, domain: np.ndarray, bit: int) -> np.ndarray:
-        even, odd = domain
-        bit = bit2sign(bit)
-
-        for i in range(len(even)):
-            avg = 0.5 * (even[i] + odd[i])
-            even[i] = avg + bit * self.alpha
-            odd[i] = avg - bit * self.alpha
-
+        self.embed_many(domain[np.newaxis], [bit])
         return domain
 
     def extract(self, domain: np.ndarray) -> int:
-        cnt = 0
-        even, odd = domain
+        return int(self.extract_many(domain[np.newaxis])[0])
 
-        for e, o in zip(even, odd):
-            cnt += bit2sign((e - o) >= 0)
+    def embed_many(self, domains: np.ndarray, bits: Sequence[int]) -> np.ndarray:
+        shift = np.where(bits, self.alpha, -self.alpha).astype(domains.dtype)
+        even, odd = domains[:, 0], domains[:, 1]
+        avg = 0.5 * (even + odd)
+        even[...] = avg + shift[:, np.newaxis]
+        odd[...] = avg - shift[:, np.newaxis]
+        return domains
 
-        return int(cnt >= 0)
+    def extract_many(self, domains: np.ndarray) -> np.ndarray:
+        even, odd = domains[:, 0], domains[:, 1]
+        positive = np.count_nonzero((even - odd) >= 0, axis=1)
+        return (2 * positive >= even.shape[1]).astype(int)
 
 
 class MeanOverWindowEdges(Method):
@@ -183,33 +212,24 @@ class MeanOverWindowEdges(Method):
     def embed(
         self, domain: np.ndarray, watermark_reader: WatermarkBitReader
     ) -> Tuple[np.ndarray, int]:
-        embedded = 0
         domain = np.asarray(domain)
-
-        for i in range(0, domain.shape[1] - (self.window_size - 1), self.window_size):
-            if not watermark_reader.available():
-                break
-            windows = domain[:, i : i + self.window_size]
-            windows, amount = self.submethod.embed(windows, watermark_reader)
-            embedded += amount
-
+        windows = self._windows(domain)
+        _, embedded = self.submethod.embed_many(windows, watermark_reader)
         return domain, embedded
 
     def extract(
         self, domain: np.ndarray, watermark_writer: WatermarkBitWriter, quantity: int
     ) -> int:
-        extracted = 0
-        domain = np.asarray(domain)
-
-        for i in range(0, domain.shape[1] - (self.window_size - 1), self.window_size):
-            if quantity < 1:
-                break
-            windows = domain[:, i : i + self.window_size]
-            amount = self.submethod.extract(windows, watermark_writer, quantity)
-            extracted += amount
-            quantity -= amount
+        if quantity < 1:
+            return 0
+        windows = self._windows(np.asarray(domain))
+        return self.submethod.extract_many(windows, watermark_writer, quantity)
 
-        return extracted
+    def _windows(self, domain: np.ndarray) -> np.ndarray:
+        count = domain.shape[1] // self.window_size
+        windows = domain[:, : count * self.window_size]
+        windows = windows.reshape(len(domain), count, self.window_size)
+        return windows.transpose(1, 0, 2)
 
 
 class MeanOverWindowEdgesBitManipulator(BitManipulator):
@@ -217,24 +237,29 @@ class MeanOverWindowEdgesBitManipulator(BitManipulator):
         self.alpha = alpha
 
     def embed(self, window: np.ndarray, bit: int) -> np.ndarray:
-        bit = bit2sign(bit)
-        sm = window[0] + window[-1]
-        window[1:-1] = 0.5 * (sm + bit * self.alpha * sm)
+        self.embed_many(window[np.newaxis], [bit])
         return window
 
     def extract(self, window: np.ndarray) -> int:
-        cnt = 0
-        avg = 0.5 * (window[0] + window[-1])
+        return int(self.extract_many(window[np.newaxis])[0])
 
-        for i in range(1, len(window)):
-            cnt += bit2sign(window[i] > avg)
+    def embed_many(self, windows: np.ndarray, bits: Sequence[int]) -> np.ndarray:
+        shift = np.where(bits, self.alpha, -self.alpha).astype(windows.dtype)
+        sm = windows[:, 0] + windows[:, -1]
+        windows[:, 1:-1] = (0.5 * (sm + shift * sm))[:, np.newaxis]
+        return windows
 
-        return int(cnt >= 0)
+    def extract_many(self, windows: np.ndarray) -> np.ndarray:
+        avg = 0.5 * (windows[:, 0] + windows[:, -1])
+        signs = np.where(windows[:, 1:] > avg[:, np.newaxis], 1, -1)
+        return (signs.sum(axis=1) >= 0).astype(int)
 
 
 class RobustnessEmphasis(Method):
     def __init__(self, bit_manipulator: BitManipulator) -> None:
         self.bit_manipulator = bit_manipulator
+        self._embed_bit = bit_manipulator.embed
+        self._extract_bit = bit_manipulator.extract
 
     def embed(
         self, domains: np.ndarray, watermark_reader: WatermarkBitReader
@@ -242,7 +267,7 @@ class RobustnessEmphasis(Method):
         bit = watermark_reader.read_bit()
 
         for d in domains:
-            self.bit_manipulator.embed(d, bit)
+            self._embed_bit(d, bit)
 
         return domains, 1
 
@@ -252,46 +277,81 @@ class RobustnessEmphasis(Method):
         cnt = 0
 
         for d in domains:
-            cnt += self.bit_manipulator.extract(d)
+            cnt += self._extract_bit(d)
 
         bit = int(cnt > len(domains) // 2)
         watermark_writer.write_bit(bit)
 
         return 1
 
+    def embed_many(
+        self, domains: np.ndarray, watermark_reader: WatermarkBitReader
+    ) -> Tuple[np.ndarray, int]:
+        bits = watermark_reader.read_block(len(domains))
+        embedded = len(bits)
+        depth = domains.shape[1]
+
+        units = domains[:embedded].reshape(-1, *domains.shape[2:])
+        units = self.bit_manipulator.embed_many(units, np.repeat(bits, depth))
+        domains[:embedded] = units.reshape(embedded, *domains.shape[1:])
+
+        return domains, embedded
+
+    def extract_many(
+        self, domains: np.ndarray, watermark_writer: WatermarkBitWriter, quantity: int
+    ) -> int:
+        domains = domains[:quantity]
+        depth = domains.shape[1]
+
+        units = domains.reshape(-1, *domains.shape[2:])
+        cnt = self.bit_manipulator.extract_many(units).reshape(-1, depth).sum(axis=1)
+        bits = (cnt > depth // 2).astype(int)
+        watermark_writer.write_block(bits.tolist())
+
+        return len(bits)
+
 
 class CapacityEmphasis(Method):
     def __init__(self, bit_manipulator: BitManipulator) -> None:
         self.bit_manipulator = bit_manipulator
+        self._embed_bit = bit_manipulator.embed
+        self._extract_bit = bit_manipulator.extract
 
     def embed(
         self, domains: np.ndarray, watermark_reader: WatermarkBitReader
     ) -> Tuple[np.ndarray, int]:
-        embedded = 0
+        bits = watermark_reader.read_block(len(domains))
 
-        for d in domains:
-            if not watermark_reader.available():
-                break
-            bit = watermark_reader.read_bit()
-            self.bit_manipulator.embed(d, bit)
-            embedded += 1
+        for d, bit in zip(domains, bits):
+            self._embed_bit(d, bit)
 
-        return domains, embedded
+        return domains, len(bits)
 
     def extract(
         self, domains: np.ndarray, watermark_writer: WatermarkBitWriter, quantity: int
     ) -> int:
-        extracted = 0
+        bits = [self._extract_bit(d) for d in domains[:quantity]]
+        watermark_writer.write_block(bits)
+        return len(bits)
 
-        for d in domains:
-            if quantity < 1:
-                break
-            bit = self.bit_manipulator.extract(d)
-            watermark_writer.write_bit(bit)
-            extracted += 1
-            quantity -= 1
+    def embed_many(
+        self, domains: np.ndarray, watermark_reader: WatermarkBitReader
+    ) -> Tuple[np.ndarray, int]:
+        units = domains.reshape(-1, *domains.shape[2:])
+        bits = watermark_reader.read_block(len(units))
 
-        return extracted
+        units[: len(bits)] = self.bit_manipulator.embed_many(units[: len(bits)], bits)
+        domains[...] = units.reshape(domains.shape)
+
+        return domains, len(bits)
+
+    def extract_many(
+        self, domains: np.ndarray, watermark_writer: WatermarkBitWriter, quantity: int
+    ) -> int:
+        units = domains.reshape(-1, *domains.shape[2:])[:quantity]
+        bits = self.bit_manipulator.extract_many(units)
+        watermark_writer.write_block(bits.tolist())
+        return len(bits)
 
 
 class Emphasis(Enum):
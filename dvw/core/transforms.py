@@ -1,13 +1,14 @@
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import List, Iterable, Reversible
+from functools import lru_cache
+from typing import List, Iterable, Reversible, Optional, Tuple
 
 import cv2
 import numpy as np
-from pywt import waverec2, wavedec2
+from pywt import waverec2, wavedec2, Wavelet
 
 from dvw.core.methods import WindowPosition
-from dvw.util import tuple2list
+from dvw.util import tuple2list, accelerated
 
 
 class Transformation(ABC):
@@ -136,12 +137,24 @@ class DepthStack(Transformation):
         return [domain[:, :, i] for i in range(depth)]
 
 
+class Precision(Enum):
+    F32 = ("f32", np.float32)
+    F64 = ("f64", np.float64)
+
+    def __new__(cls, value: str, dtype: type) -> "Precision":
+        obj = object().__new__(cls)
+        obj._value_ = value
+        obj.dtype = dtype
+        return obj
+
+
 class Normalize(Transformation):
-    def __init__(self, factor: float) -> None:
+    def __init__(self, factor: float, dtype: Optional[type] = None) -> None:
         self.factor = factor
+        self.dtype = dtype
 
     def transform(self, domain, memory: list) -> np.ndarray:
-        return np.divide(domain, self.factor)
+        return np.divide(domain, self.factor, dtype=self.dtype)
 
     def restore(self, domain: np.ndarray, memory: list) -> np.ndarray:
         return np.multiply(domain, self.factor)
@@ -149,29 +162,27 @@ class Normalize(Transformation):
 
 class ToZigzagOrder(Transformation):
     def transform(self, domain, memory: list) -> np.ndarray:
-        shape = np.shape(domain)[:2]
+        domain = np.asarray(domain)
+        shape = domain.shape[:2]
         memory.append(shape)
-        return np.asarray([domain[i][j] for i, j in self._zigzag_indices(*shape)])
+        return domain[_zigzag_indices(*shape)]
 
     def restore(self, array: np.ndarray, memory: list) -> np.ndarray:
-        rows, columns = memory.pop()
-        domain = [[0 for _ in range(columns)] for _ in range(rows)]
-        for k, (i, j) in enumerate(self._zigzag_indices(rows, columns)):
-            domain[i][j] = array[k]
-        return np.asarray(domain)
-
-    def _zigzag_indices(self, rows: int, columns: int) -> np.ndarray:
-        indices = [[] for _ in range(rows + columns - 1)]
+        shape = memory.pop()
+        array = np.asarray(array)
+        domain = np.empty(shape, dtype=array.dtype)
+        domain[_zigzag_indices(*shape)] = array
+        return domain
 
-        for i in range(rows):
-            for j in range(columns):
-                sm = i + j
-                if sm % 2 == 0:
-                    indices[sm].insert(0, (i, j))
-                else:
-                    indices[sm].append((i, j))
 
-        return np.concatenate(indices)
+@lru_cache(maxsize=16)
+def _zigzag_indices(rows: int, columns: int) -> Tuple[np.ndarray, np.ndarray]:
+    i, j = np.indices((rows, columns)).reshape(2, -1)
+    diagonal = i + j
+    order = np.lexsort((np.where(diagonal % 2, i, -i), diagonal))
+    i, j = i[order], j[order]
+    i.flags.writeable = j.flags.writeable = False
+    return i, j
 
 
 class EvenOddDecomposition(Transformation):
@@ -179,11 +190,20 @@ class EvenOddDecomposition(Transformation):
         return domain[::2], domain[1::2]
 
     def restore(self, domain, memory: list) -> np.ndarray:
-        return np.vstack((domain[0], domain[1])).ravel(order="F")
+        even, odd = map(np.ravel, domain)
+        array = np.empty(even.size + odd.size, dtype=np.result_type(even, odd))
+        array[::2] = even
+        array[1::2] = odd
+        return array
 
 
 class SingularValueDecomposition(Transformation):
+    def __init__(self, compute_uv: bool = True) -> None:
+        self.compute_uv = compute_uv
+
     def transform(self, domain, memory: list):
+        if not self.compute_uv:
+            return None, np.linalg.svd(domain, compute_uv=False), None
         return np.linalg.svd(domain, full_matrices=False)
 
     def restore(self, domain, memory: list):
@@ -197,10 +217,10 @@ class ToColorSpace(Transformation):
         self.inverse_color_code = inverse_color_code
 
     def transform(self, color, memory: list) -> np.ndarray:
-        return cv2.cvtColor(color, self.color_code)
+        return accelerated(cv2.cvtColor, color, self.color_code)
 
     def restore(self, color, memory: list) -> np.ndarray:
-        return cv2.cvtColor(color, self.inverse_color_code)
+        return accelerated(cv2.cvtColor, color, self.inverse_color_code)
 
 
 class ToCosineTransform(Transformation):
@@ -217,7 +237,7 @@ class ToCosineTransform(Transformation):
 
 class ToWavelet(Transformation):
     def __init__(self, wavelet: str, level: int) -> None:
-        self.wavelet = wavelet
+        self.wavelet = Wavelet(wavelet)
         self.level = level
 
     def transform(self, domain, memory: list):
@@ -232,29 +252,98 @@ class ToWavelet(Transformation):
         return waverec2(coeffs, self.wavelet)
 
 
-def frame2wavelet(wavelet: str, level: int, *subbands: WaveletSubband) -> Pipe:
+class ToHaarWavelet(ToWavelet):
+    def __init__(self) -> None:
+        super().__init__("haar", 1)
+        self.coefficient = self.wavelet.dec_lo[0]
+
+    def transform(self, domain, memory: list):
+        domain = np.asarray(domain)
+        height, width = domain.shape
+        if height % 2 or width % 2:
+            return super().transform(domain, memory)
+        memory.append(None)
+
+        low, high = self._split(domain, 0)
+        ll, lh = self._split(low, 1)
+        hl, hh = self._split(high, 1)
+        return ll, hl, lh, hh
+
+    def restore(self, subbands, memory: list) -> np.ndarray:
+        if memory[-1] is not None:
+            return super().restore(subbands, memory)
+        memory.pop()
+
+        ll, hl, lh, hh = map(np.asarray, subbands)
+        low = self._merge(ll, lh, 1)
+        high = self._merge(hl, hh, 1)
+        return self._merge(low, high, 0)
+
+    def _split(self, domain: np.ndarray, axis: int) -> Tuple[np.ndarray, np.ndarray]:
+        even = domain[_haar_slice(axis, 0)] * self.coefficient
+        odd = domain[_haar_slice(axis, 1)] * self.coefficient
+        return even + odd, even - odd
+
+    def _merge(self, low: np.ndarray, high: np.ndarray, axis: int) -> np.ndarray:
+        low = low * self.coefficient
+        high = high * self.coefficient
+        shape = list(low.shape)
+        shape[axis] *= 2
+        domain = np.empty(shape, dtype=np.result_type(low, high))
+        domain[_haar_slice(axis, 0)] = low + high
+        domain[_haar_slice(axis, 1)] = low - high
+        return domain
+
+
+def _haar_slice(axis: int, start: int) -> tuple:
+    return (slice(None),) * axis + (slice(start, None, 2),)
+
+
+def to_wavelet(wavelet: str, level: int) -> ToWavelet:
+    if wavelet == "haar" and level == 1:
+        return ToHaarWavelet()
+    return ToWavelet(wavelet, level)
+
+
+def frame2wavelet(
+    wavelet: str,
+    level: int,
+    *subbands: WaveletSubband,
+    precision: Precision = Precision.F64
+) -> Pipe:
     return Pipe(
         ToColorSpace(cv2.COLOR_BGR2YCrCb, cv2.COLOR_YCrCb2BGR),
         ChannelFilter(0),
-        Normalize(255),
-        ToWavelet(wavelet, level),
+        Normalize(255, precision.dtype),
+        to_wavelet(wavelet, level),
         WaveletFilter(*subbands),
     )
 
 
+@lru_cache(maxsize=64)
 def frame2dwt_stack(
-    wavelet: str, level: int, position: WindowPosition, *subbands: WaveletSubband
+    wavelet: str,
+    level: int,
+    position: WindowPosition,
+    *subbands: WaveletSubband,
+    precision: Precision = Precision.F64
 ) -> Pipe:
-    pipe = frame2wavelet(wavelet, level, *subbands)
+    pipe = frame2wavelet(wavelet, level, *subbands, precision=precision)
     if WindowPosition.VERTICAL == position:
         pipe.extend(Every(Transpose()))
     pipe.extend(DepthStack())
     return pipe
 
 
-def frame2dwt_dct(wavelet: str, level: int, *subbands: WaveletSubband) -> Pipe:
+@lru_cache(maxsize=64)
+def frame2dwt_dct(
+    wavelet: str,
+    level: int,
+    *subbands: WaveletSubband,
+    precision: Precision = Precision.F64
+) -> Pipe:
     return Pipe(
-        frame2wavelet(wavelet, level, *subbands),
+        frame2wavelet(wavelet, level, *subbands, precision=precision),
         Every(
             ToZigzagOrder(),
             EvenOddDecomposition(),
@@ -263,8 +352,9 @@ def frame2dwt_dct(wavelet: str, level: int, *subbands: WaveletSubband) -> Pipe:
     )
 
 
-def frame2dwt_svd(wavelet, level, *subbands):
+@lru_cache(maxsize=64)
+def frame2dwt_svd(wavelet, level, *subbands, compute_uv=True, precision=Precision.F64):
     return Pipe(
-        frame2wavelet(wavelet, level, *subbands),
-        Every(SingularValueDecomposition(), ItemFilter(1)),
+        frame2wavelet(wavelet, level, *subbands, precision=precision),
+        Every(SingularValueDecomposition(compute_uv), ItemFilter(1)),
     )
@@ -1,33 +1,68 @@
+import os
+import subprocess
 from abc import ABC, abstractmethod
 from enum import Enum, auto
-from typing import Tuple, Optional, Any
+from functools import lru_cache
+from queue import Queue, Full
+from tempfile import TemporaryDirectory, TemporaryFile
+from threading import Thread, Event
+from typing import Tuple, Optional, Any, List, Union, Callable, Iterable
 
 import cv2
+import ffmpeg
 import numpy as np
 
 from dvw.util import shape2shape, istuple
 from dvw.util.base import AutoCloseable, Observable
-from dvw.util.types import Shape2d, FrameWithReturn
+from dvw.util.types import (
+    Shape2d,
+    FrameWithReturn,
+    Shape2dParameters,
+    FramePairHandler,
+)
+
+
+class HardwareAcceleration(Enum):
+    NONE = ("none", None)
+    ANY = ("any", None, cv2.VIDEO_ACCELERATION_ANY)
+    CUVID = ("cuvid", "hwaccel;cuda|video_codec;h264_cuvid")
+    VAAPI = ("vaapi", "hwaccel;vaapi")
+
+    def __new__(
+        cls, value: str, options: Optional[str], acceleration: Optional[int] = None
+    ) -> "HardwareAcceleration":
+        obj = object().__new__(cls)
+        obj._value_ = value
+        obj.options = options
+        obj.acceleration = acceleration
+        return obj
 
 
 class VideoReader(AutoCloseable):
-    def __init__(self, path: str) -> None:
-        self.video = cv2.VideoCapture(path)
+    def __init__(
+        self, path: str, hwaccel: Optional[HardwareAcceleration] = None
+    ) -> None:
+        self.video = _open_capture(path, hwaccel)
+        self._fps = int(self.video.get(cv2.CAP_PROP_FPS))
+        self._width = int(self.video.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self._height = int(self.video.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self._frames = int(self.video.get(cv2.CAP_PROP_FRAME_COUNT))
+        self._position = int(self.video.get(cv2.CAP_PROP_POS_FRAMES))
 
     def close(self) -> None:
         self.video.release()
 
     @property
     def fps(self) -> int:
-        return int(self.video.get(cv2.CAP_PROP_FPS))
+        return self._fps
 
     @property
     def width(self) -> int:
-        return int(self.video.get(cv2.CAP_PROP_FRAME_WIDTH))
+        return self._width
 
     @property
     def height(self) -> int:
-        return int(self.video.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        return self._height
 
     @property
     def shape(self) -> Shape2d:
@@ -35,14 +70,66 @@ class VideoReader(AutoCloseable):
 
     @property
     def frames(self) -> int:
-        return int(self.video.get(cv2.CAP_PROP_FRAME_COUNT))
+        return self._frames
 
     @property
     def position(self) -> int:
-        return int(self.video.get(cv2.CAP_PROP_POS_FRAMES))
+        return self._position
+
+    def seek(self, position: int) -> None:
+        self.video.set(cv2.CAP_PROP_POS_FRAMES, position)
+        self._position = int(self.video.get(cv2.CAP_PROP_POS_FRAMES))
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        success, frame = self.video.read()
+        if success:
+            self._position += 1
+        return success, frame
+
+
+class PrefetchVideoReader(VideoReader):
+    def __init__(
+        self,
+        path: str,
+        prefetch: int = 8,
+        hwaccel: Optional[HardwareAcceleration] = None,
+    ) -> None:
+        super().__init__(path, hwaccel)
+        self.prefetch = prefetch
+        self._start_prefetching()
+
+    def close(self) -> None:
+        self._stop_prefetching()
+        super().close()
+
+    def seek(self, position: int) -> None:
+        self._stop_prefetching()
+        super().seek(position)
+        self._start_prefetching()
 
     def read(self) -> Tuple[bool, Optional[np.ndarray]]:
-        return self.video.read()
+        frame = self._queue.get()
+        if frame is None:
+            self._queue.put(None)
+            return False, None
+        self._position += 1
+        return True, frame
+
+    def _start_prefetching(self) -> None:
+        self._queue = Queue(maxsize=self.prefetch)
+        self._stop = Event()
+        self._thread = Thread(target=self._read_frames, daemon=True)
+        self._thread.start()
+
+    def _stop_prefetching(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _read_frames(self) -> None:
+        success, frame = self.video.read()
+        while success and _put(self._queue, frame, self._stop):
+            success, frame = self.video.read()
+        _put(self._queue, None, self._stop)
 
 
 class PairVideoReader(AutoCloseable):
@@ -59,6 +146,96 @@ class PairVideoReader(AutoCloseable):
         success2, frame2 = self.video2.read()
         return success1 and success2, frame1, frame2
 
+    def read_batch(self, size: int) -> Tuple[List[np.ndarray], List[np.ndarray]]:
+        frames1, frames2 = [], []
+        while len(frames1) < size:
+            success, frame1, frame2 = self.read()
+            if not success:
+                break
+            frames1.append(frame1)
+            frames2.append(frame2)
+        return frames1, frames2
+
+
+class FFmpegWriterError(ffmpeg.Error):
+    def __str__(self) -> str:
+        return self.stderr.decode(errors="replace").strip() or super().__str__()
+
+
+class FFmpegVideoWriter:
+    def __init__(self, path: str, codec: str, fps: int, size: Tuple[int, int]) -> None:
+        width, height = size
+        options = {"vcodec": codec}
+        if width % 2 == 0 and height % 2 == 0:
+            options["pix_fmt"] = "yuv420p"
+        args = (
+            ffmpeg.input(
+                "pipe:",
+                format="rawvideo",
+                pix_fmt="bgr24",
+                s=f"{width}x{height}",
+                r=fps,
+            )
+            .output(path, **options)
+            .global_args("-loglevel", "error")
+            .overwrite_output()
+            .compile()
+        )
+        self._stderr = TemporaryFile()
+        self.process = subprocess.Popen(
+            args, stdin=subprocess.PIPE, stderr=self._stderr
+        )
+
+    def write(self, frame: np.ndarray) -> None:
+        try:
+            self.process.stdin.write(np.ascontiguousarray(frame).tobytes())
+        except BrokenPipeError:
+            raise self._error() from None
+
+    def release(self) -> None:
+        try:
+            self.process.stdin.close()
+        except BrokenPipeError:
+            pass
+        error = self._error() if self.process.wait() else None
+        self._stderr.close()
+        if error:
+            raise error
+
+    def _error(self) -> FFmpegWriterError:
+        self.process.wait()
+        self._stderr.seek(0)
+        return FFmpegWriterError("ffmpeg", None, self._stderr.read())
+
+
+class BackgroundVideoWriter:
+    def __init__(self, writer, backlog: int = 8) -> None:
+        self.writer = writer
+        self._frames = Queue(maxsize=backlog)
+        self._error = None
+        self._thread = Thread(target=self._write_frames, daemon=True)
+        self._thread.start()
+
+    def write(self, frame: np.ndarray) -> None:
+        self._frames.put(frame)
+
+    def release(self) -> None:
+        self._frames.put(None)
+        self._thread.join()
+        self.writer.release()
+        if self._error:
+            raise self._error
+
+    def _write_frames(self) -> None:
+        frame = self._frames.get()
+        while frame is not None:
+            if not self._error:
+                try:
+                    self.writer.write(frame)
+                except Exception as e:
+                    self._error = e
+            frame = self._frames.get()
+
 
 class VideoTunnelEvent(Enum):
     BEFORE_FRAME_COPY = auto()
@@ -78,16 +255,22 @@ class VideoTunnel(AutoCloseable, Observable):
         output_path: str,
         codec: str,
         fps: Optional[int] = None,
-        shape: Optional[Shape2d] = None,
+        shape: Union[Shape2dParameters, Callable[[Shape2d], Shape2d]] = None,
+        prefetch: int = 0,
+        hwaccel: Optional[HardwareAcceleration] = None,
     ) -> None:
         super().__init__()
-        self.reader = VideoReader(input_path)
-        self.writer = cv2.VideoWriter(
+        self.reader = create_video_reader(input_path, prefetch, hwaccel)
+        if callable(shape):
+            shape = shape(self.reader.shape)
+        self.writer = create_video_writer(
             output_path,
-            codec2code(codec),
+            codec,
             fps or self.reader.fps,
             shape2shape(self.reader.shape, shape)[::-1],
         )
+        if prefetch:
+            self.writer = BackgroundVideoWriter(self.writer, prefetch)
 
     def close(self) -> None:
         self.reader.close()
@@ -105,29 +288,114 @@ class VideoTunnel(AutoCloseable, Observable):
         while self.transfer(handler)[0]:
             pass
 
-    def transfer(self, handler: FrameHandler) -> Tuple[bool, Any]:
+    def transfer_range(
+        self, handler: FrameHandler, start: int, stop: Optional[int] = None
+    ) -> None:
+        self.reader.seek(start)
+        if stop is None:
+            self.transfer_all(handler)
+            return
+        for _ in range(start, stop):
+            if not self.transfer(handler)[0]:
+                break
+
+    def transfer(
+        self, handler: FrameHandler, on_frame_pair: Optional[FramePairHandler] = None
+    ) -> Tuple[bool, Any]:
         success, frame = self.reader.read()
         if success:
             result = handler.handle(frame)
-            frame = result[0] if istuple(result) else result
-            self.writer.write(frame)
+            output = result[0] if istuple(result) else result
+            self.writer.write(output)
+            if on_frame_pair:
+                on_frame_pair(frame, output)
             return (success, *result)
         return success, None
 
-    def copy_frames(self) -> int:
+    def copy_frames(self, on_frame_pair: Optional[FramePairHandler] = None) -> int:
         copied = 0
         success, frame = self.reader.read()
         while success:
             self._notify_copy(VideoTunnelEvent.BEFORE_FRAME_COPY, copied)
             self.writer.write(frame)
+            if on_frame_pair:
+                on_frame_pair(frame, frame)
             copied += 1
             self._notify_copy(VideoTunnelEvent.AFTER_FRAME_COPY, copied)
             success, frame = self.reader.read()
         return copied
 
     def _notify_copy(self, event, copied: int) -> None:
+        if not self.subscribed(event):
+            return
         self.notify(event, position=self.position, total=self.frames, copied=copied)
 
 
+def _put(queue: Queue, item: Any, stop: Event, timeout: float = 0.1) -> bool:
+    while not stop.is_set():
+        try:
+            queue.put(item, timeout=timeout)
+            return True
+        except Full:
+            pass
+    return False
+
+
+def _open_capture(
+    path: str, hwaccel: Optional[HardwareAcceleration]
+) -> cv2.VideoCapture:
+    if not hwaccel or hwaccel is HardwareAcceleration.NONE:
+        return cv2.VideoCapture(path)
+    if hwaccel.acceleration is not None:
+        params = [cv2.CAP_PROP_HW_ACCELERATION, hwaccel.acceleration]
+        return _fallback(cv2.VideoCapture(path, cv2.CAP_FFMPEG, params), path)
+
+    previous = os.environ.get(_CAPTURE_OPTIONS)
+    os.environ[_CAPTURE_OPTIONS] = hwaccel.options
+    try:
+        video = cv2.VideoCapture(path, cv2.CAP_FFMPEG)
+    finally:
+        if previous is None:
+            del os.environ[_CAPTURE_OPTIONS]
+        else:
+            os.environ[_CAPTURE_OPTIONS] = previous
+    return _fallback(video, path)
+
+
+def _fallback(video: cv2.VideoCapture, path: str) -> cv2.VideoCapture:
+    if not video.isOpened():
+        video.release()
+        video = cv2.VideoCapture(path)
+    return video
+
+
+def create_video_reader(
+    path: str, prefetch: int = 0, hwaccel: Optional[HardwareAcceleration] = None
+) -> VideoReader:
+    if prefetch:
+        return PrefetchVideoReader(path, prefetch, hwaccel)
+    return VideoReader(path, hwaccel)
+
+
+def create_video_writer(path: str, codec: str, fps: int, size: Tuple[int, int]):
+    if len(codec) == 4:
+        return cv2.VideoWriter(path, codec2code(codec), fps, size)
+    return FFmpegVideoWriter(path, codec, fps, size)
+
+
+def concat_videos(paths: Iterable[str], output_path: str) -> None:
+    with TemporaryDirectory() as tmp:
+        path_list = os.path.join(tmp, "paths.txt")
+        with open(path_list, "w") as file:
+            file.writelines(f"file '{os.path.abspath(p)}'\n" for p in paths)
+        ffmpeg.input(path_list, format="concat", safe=0).output(
+            output_path, c="copy"
+        ).overwrite_output().run(quiet=True)
+
+
+@lru_cache(maxsize=16)
 def codec2code(codec: str) -> int:
     return cv2.VideoWriter_fourcc(*codec)
+
+
+_CAPTURE_OPTIONS = "OPENCV_FFMPEG_CAPTURE_OPTIONS"
@@ -2,7 +2,17 @@ from abc import ABC, abstractmethod
 from enum import Enum
 from random import Random
 from types import TracebackType
-from typing import Optional, Union, AnyStr, Callable, Any, Iterable, Type, SupportsInt
+from typing import (
+    Optional,
+    Union,
+    AnyStr,
+    Callable,
+    Any,
+    Iterable,
+    Type,
+    SupportsInt,
+    Sequence,
+)
 
 import cv2
 import numpy as np
@@ -19,6 +29,12 @@ class WatermarkBitReader(AutoCloseable, ABC):
     def read_bit(self) -> int:
         pass
 
+    def read_block(self, size: int) -> Sequence[int]:
+        bits = []
+        while len(bits) < size and self.available():
+            bits.append(self.read_bit())
+        return bits
+
 
 class WatermarkBatchReader(AutoCloseable, ABC):
     @abstractmethod
@@ -40,6 +56,12 @@ class WatermarkBitGenerator(WatermarkBitReader, ABC):
         if self.size and self.size > 0:
             self.size -= 1
 
+    def _reserve(self, size: int) -> int:
+        if self.size is not None:
+            size = max(min(size, self.size), 0)
+            self.size -= size
+        return size
+
 
 class WatermarkBitWriter(AutoCloseable, ABC):
     def __exit__(
@@ -59,6 +81,10 @@ class WatermarkBitWriter(AutoCloseable, ABC):
     def write_bit(self, bit: int) -> None:
         pass
 
+    def write_block(self, bits: Iterable[int]) -> None:
+        for bit in bits:
+            self.write_bit(bit)
+
 
 class ConstantBitReader(WatermarkBitGenerator):
     def __init__(self, bit: SupportsInt, size: Optional[int] = None) -> None:
@@ -69,6 +95,9 @@ class ConstantBitReader(WatermarkBitGenerator):
         self._reduce_size()
         return self.bit
 
+    def read_block(self, size: int) -> Sequence[int]:
+        return [self.bit] * self._reserve(size)
+
 
 class RandomBitReader(WatermarkBitGenerator):
     def __init__(self, seed: Union[float, AnyStr], size: Optional[int] = None) -> None:
@@ -79,9 +108,38 @@ class RandomBitReader(WatermarkBitGenerator):
         self._reduce_size()
         return self.generator.getrandbits(1)
 
+    def read_block(self, size: int) -> Sequence[int]:
+        size = self._reserve(size)
+        if size < 1:
+            return []
+        words = self.generator.getrandbits(32 * size).to_bytes(4 * size, "little")
+        return (np.frombuffer(words, dtype="<u4") >> 31).astype(np.uint8)
+
+
+class BitSequenceReader(WatermarkBitReader):
+    def __init__(self, bits: Sequence[int]) -> None:
+        self.bits = bits
+        self.current = 0
+
+    def close(self) -> None:
+        pass
+
+    def available(self) -> bool:
+        return self.current < len(self.bits)
+
+    def read_bit(self) -> int:
+        bit = self.bits[self.current]
+        self.current += 1
+        return bit
+
+    def read_block(self, size: int) -> Sequence[int]:
+        bits = self.bits[self.current : self.current + size]
+        self.current += len(bits)
+        return bits
+
 
 class BitFileReader(WatermarkBitReader, WatermarkBatchReader):
-    def __init__(self, path: str, buffering: int = 4096) -> None:
+    def __init__(self, path: str, buffering: int = 262144) -> None:
         self.file = open(path, "rb", buffering)
         self.buffer = 0
         self.eof = False
@@ -110,13 +168,33 @@ class BitFileReader(WatermarkBitReader, WatermarkBatchReader):
             self.eof = len(byte_) == 0
             self.current = 0
 
+    def read_block(self, size: int) -> Sequence[int]:
+        bits = []
+        while len(bits) < size and self.current < 8 and self.available():
+            bits.append(self.read_bit())
+        if len(bits) == size or self.eof:
+            return bits
+
+        needed = size - len(bits)
+        data = self.file.read(-(-needed // 8))
+        unpacked = np.unpackbits(np.frombuffer(data, np.uint8), bitorder="little")
+        bits.extend(unpacked[:needed].tolist())
+
+        used = min(needed, unpacked.size)
+        if used % 8:
+            self.buffer = data[used // 8] >> (used % 8)
+            self.current = used % 8
+        else:
+            self.current = 8
+        return bits
+
     def read_all(self) -> Iterable[int]:
         self.eof = True
         return self.file.read()
 
 
 class BitFileWriter(WatermarkBitWriter):
-    def __init__(self, path: str, buffering: int = 4096) -> None:
+    def __init__(self, path: str, buffering: int = 262144) -> None:
         self.file = open(path, "wb", buffering)
         self.buffer = 0
         self.current = 0
@@ -138,6 +216,21 @@ class BitFileWriter(WatermarkBitWriter):
             self.buffer = 0
             self.current = 0
 
+    def write_block(self, bits: Iterable[int]) -> None:
+        bits = list(bits)
+        start = min((8 - self.current) % 8, len(bits))
+        for bit in bits[:start]:
+            self.write_bit(bit)
+
+        rest = bits[start:]
+        whole = len(rest) - len(rest) % 8
+        if whole:
+            packed = np.packbits(np.asarray(rest[:whole], np.uint8), bitorder="little")
+            self.file.write(packed.tobytes())
+
+        for bit in rest[whole:]:
+            self.write_bit(bit)
+
 
 class BWImageReader(WatermarkBitReader, WatermarkBatchReader):
     def __init__(self, path: str, width: Optional[int] = None) -> None:
@@ -172,6 +265,11 @@ class BWImageReader(WatermarkBitReader, WatermarkBatchReader):
         self.current += 1
         return bit
 
+    def read_block(self, size: int) -> Sequence[int]:
+        bits = self.buffer[self.current : self.current + size]
+        self.current += len(bits)
+        return bits
+
     def read_all(self) -> Iterable[int]:
         self.current = len(self.buffer)
         return self.buffer
@@ -191,12 +289,15 @@ class BWImageWriter(WatermarkBitWriter):
         cv2.imwrite(self.path, bw)
 
     def _buffer2bw(self) -> np.ndarray:
-        bw = [(255 if b else 0) for b in self.buffer]
-        return np.reshape(bw, (-1, self.width))
+        bw = np.asarray(self.buffer, dtype=bool) * np.uint8(255)
+        return bw.reshape(-1, self.width)
 
     def write_bit(self, bit: int) -> None:
         self.buffer.append(bit)
 
+    def write_block(self, bits: Iterable[int]) -> None:
+        self.buffer.extend(bits)
+
 
 class WatermarkType(Enum):
     BIT_FILE = (
@@ -1,15 +1,39 @@
-from typing import List
+import math
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import List, Sequence, Optional
 
 import cv2
 import numpy as np
-from skimage.metrics import structural_similarity
 
 from dvw.io.video import PairVideoReader
 from dvw.metrics.base import BaseMetric, MetricValue, Comparator
 
+_SSIM_WINDOW = 7
+_SSIM_COVARIANCE_NORM = _SSIM_WINDOW ** 2 / (_SSIM_WINDOW ** 2 - 1)
+_SSIM_C1 = (0.01 * 255) ** 2
+_SSIM_C2 = (0.03 * 255) ** 2
+
 
 def ssim(frame1: np.ndarray, frame2: np.ndarray) -> float:
-    return structural_similarity(frame1, frame2, multichannel=True)
+    x = frame1.astype(np.float32)
+    y = frame2.astype(np.float32)
+
+    mx, my = _local_mean(x), _local_mean(y)
+    mxx, myy, mxy = mx * mx, my * my, mx * my
+    vx = _SSIM_COVARIANCE_NORM * (_local_mean(x * x) - mxx)
+    vy = _SSIM_COVARIANCE_NORM * (_local_mean(y * y) - myy)
+    vxy = _SSIM_COVARIANCE_NORM * (_local_mean(x * y) - mxy)
+
+    s = ((2 * mxy + _SSIM_C1) * (2 * vxy + _SSIM_C2)) / (
+        (mxx + myy + _SSIM_C1) * (vx + vy + _SSIM_C2)
+    )
+
+    pad = _SSIM_WINDOW // 2
+    return float(s[pad:-pad, pad:-pad].mean(dtype=np.float64))
+
+
+def _local_mean(x: np.ndarray) -> np.ndarray:
+    return cv2.blur(x, (_SSIM_WINDOW, _SSIM_WINDOW), borderType=cv2.BORDER_REFLECT)
 
 
 class VideoMetric(BaseMetric):
@@ -18,31 +42,67 @@ class VideoMetric(BaseMetric):
 
 
 class VideoComparator(Comparator):
-    def __init__(self, precision: int, *metrics: VideoMetric) -> None:
+    def __init__(
+        self,
+        precision: int,
+        *metrics: VideoMetric,
+        batch_size: int = 8,
+        workers: Optional[int] = None,
+    ) -> None:
         super().__init__(precision)
         self.metrics = metrics or list(VideoMetric)
+        self.batch_size = batch_size
+        self.workers = workers
+        self._calculate_fns = tuple(m.calculate for m in self.metrics)
+        self._reset()
+
+    def update(self, frame1: np.ndarray, frame2: np.ndarray) -> None:
+        for i, fn in enumerate(self._calculate_fns):
+            self._total[i] += fn(frame1, frame2)
+        self._cnt += 1
+
+    def finalize(self) -> List[MetricValue]:
+        metric_values = self._calc_avg_metrics(self._total, self._cnt)
+        self._reset()
+        return metric_values
+
+    def _reset(self) -> None:
+        self._cnt = 0
+        self._total = [0.0] * len(self._calculate_fns)
 
     def compare(self, path1: str, path2: str) -> List[MetricValue]:
-        with PairVideoReader(path1, path2) as pair_video:
-            return self._compare_frames(pair_video)
+        with PairVideoReader(path1, path2) as pair_video, ThreadPoolExecutor(
+            self.workers
+        ) as executor:
+            return self._compare_frames(pair_video, executor)
 
-    def _compare_frames(self, pair_video: PairVideoReader) -> List[MetricValue]:
+    def _compare_frames(
+        self, pair_video: PairVideoReader, executor: Executor
+    ) -> List[MetricValue]:
         cnt = 0
-        total = np.zeros(len(self.metrics))
+        total = [0.0] * len(self._calculate_fns)
 
-        success, frame1, frame2 = pair_video.read()
-        while success:
-            total += self._calculate_metrics(frame1, frame2)
-            success, frame1, frame2 = pair_video.read()
-            cnt += 1
+        frames1, frames2 = pair_video.read_batch(self.batch_size)
+        while frames1:
+            self._accumulate_metrics(total, frames1, frames2, executor)
+            cnt += len(frames1)
+            frames1, frames2 = pair_video.read_batch(self.batch_size)
 
         return self._calc_avg_metrics(total, cnt)
 
-    def _calculate_metrics(self, frame1: np.ndarray, frame2: np.ndarray) -> List[float]:
-        return [m.calculate(frame1, frame2) for m in self.metrics]
+    def _accumulate_metrics(
+        self,
+        total: List[float],
+        frames1: Sequence[np.ndarray],
+        frames2: Sequence[np.ndarray],
+        executor: Executor,
+    ) -> None:
+        for i, fn in enumerate(self._calculate_fns):
+            total[i] += sum(executor.map(fn, frames1, frames2))
 
-    def _calc_avg_metrics(self, total: np.ndarray, cnt: int) -> List[MetricValue]:
+    def _calc_avg_metrics(self, total: List[float], cnt: int) -> List[MetricValue]:
+        inverse = 1.0 / cnt if cnt else math.nan
         return [
-            MetricValue(m, round(t / cnt, self.precision))
+            MetricValue(m, round(t * inverse, self.precision))
             for m, t in zip(self.metrics, total)
         ]
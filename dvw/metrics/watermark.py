@@ -1,24 +1,26 @@
-from typing import List
+from typing import List, Tuple, Iterable
 
 import numpy as np
 
-from dvw.io.watermark import WatermarkBatchReader, WatermarkType, WatermarkBitReader
+from dvw.io.watermark import WatermarkType
 from dvw.metrics.base import BaseMetric, MetricValue, Comparator
 
 
 def _ber(
-    watermark_reader1: WatermarkBitReader,
-    watermark_reader2: WatermarkBitReader,
+    watermark1: Iterable[int],
+    watermark2: Iterable[int],
     precision: int,
 ) -> MetricValue:
-    errors = 0
-    total = 0
+    packed1, size1 = _pack_bits(watermark1)
+    packed2, size2 = _pack_bits(watermark2)
 
-    while watermark_reader1.available() and watermark_reader2.available():
-        bit1 = watermark_reader1.read_bit()
-        bit2 = watermark_reader2.read_bit()
-        errors += bit1 != bit2
-        total += 1
+    total = min(size1, size2)
+    length, tail = divmod(total, 8)
+    diff = packed1[:length] ^ packed2[:length]
+    errors = int(np.unpackbits(diff).sum())
+    if tail:
+        last = (packed1[length] ^ packed2[length]) >> (8 - tail)
+        errors += bin(last).count("1")
 
     ber_ = 100 * ((errors / total) if total else 1)
     ber_ = round(ber_, precision)
@@ -26,18 +28,29 @@ def _ber(
     return MetricValue(WatermarkMetric.BER, values)
 
 
+def _pack_bits(watermark: Iterable[int]) -> Tuple[np.ndarray, int]:
+    if isinstance(watermark, (bytes, bytearray)):
+        packed = np.frombuffer(watermark, dtype=np.uint8)
+        return packed, 8 * packed.size
+    bits = np.asarray(watermark, dtype=np.uint8)
+    return np.packbits(bits), bits.size
+
+
 def _normalized_correlation(
-    watermark_reader1: WatermarkBatchReader,
-    watermark_reader2: WatermarkBatchReader,
+    watermark1: Iterable[int],
+    watermark2: Iterable[int],
     precision: int,
 ) -> MetricValue:
-    a = list(watermark_reader1.read_all())
-    b = list(watermark_reader2.read_all())
+    a = np.fromiter(watermark1, dtype=np.float32)
+    b = np.fromiter(watermark2, dtype=np.float32)
+
+    size = min(a.size, b.size)
+    a, b = a[:size], b[:size]
 
     a = (a - np.mean(a)) / (np.std(a) * len(a))
     b = (b - np.mean(b)) / (np.std(b))
 
-    nc = round(np.correlate(a, b)[0], precision)
+    nc = round(float(a @ b), precision)
     return MetricValue(WatermarkMetric.NC, nc)
 
 
@@ -54,24 +67,14 @@ class WatermarkComparator(Comparator):
     def compare(
         self, path1: str, path2: str, watermark_type: WatermarkType, **kwargs
     ) -> List[MetricValue]:
-        return [
-            self._calculate_metric(path1, path2, watermark_type, m, **kwargs)
-            for m in self.metrics
-        ]
-
-    def _calculate_metric(
-        self,
-        path1: str,
-        path2: str,
-        watermark_type: WatermarkType,
-        metric: WatermarkMetric,
-        **kwargs
-    ) -> MetricValue:
         with watermark_type.reader(
             path1, **kwargs
         ) as watermark_reader1, watermark_type.reader(
             path2, **kwargs
         ) as watermark_reader2:
-            return metric.calculate(
-                watermark_reader1, watermark_reader2, self.precision
-            )
+            watermark1 = watermark_reader1.read_all()
+            watermark2 = watermark_reader2.read_all()
+
+        return [
+            m.calculate(watermark1, watermark2, self.precision) for m in self.metrics
+        ]
@@ -1 +1 @@
-from dvw.probe.probe import ProbeField, VideoProbe, probe
+from dvw.probe.probe import ProbeField, VideoProbe, probe, probe_many
@@ -1,6 +1,8 @@
+import asyncio
+
 import click
 
-from dvw.probe import probe as probe_
+from dvw.probe import probe_many
 from dvw.ui.terminal import print_probe
 
 
@@ -8,7 +10,7 @@ from dvw.ui.terminal import print_probe
     help="Show media and codec information",
     short_help="Show media and codec information",
 )
-@click.argument("file", type=click.Path(exists=True))
-def probe(file):
-    video_probe = probe_(file)
-    print_probe(video_probe)
+@click.argument("files", nargs=-1, required=True, type=click.Path(exists=True))
+def probe(files):
+    for video_probe in asyncio.run(probe_many(files)):
+        print_probe(video_probe)
@@ -1,5 +1,9 @@
+import asyncio
+import json
+import os
 from dataclasses import dataclass
-from typing import Callable, Any, List, Optional, Dict, Tuple, Iterable
+from functools import lru_cache
+from typing import Callable, Any, List, Optional, Dict, Tuple, Iterable, NamedTuple
 
 import ffmpeg
 
@@ -7,13 +11,17 @@ from dvw.util import filename
 from dvw.util.unit import bitrate2human, size2human, seconds2human
 
 
-@dataclass
-class ProbeField:
+class ProbeField(NamedTuple):
     name: str
     label: str
     handler: Optional[Callable[[str], Any]] = None
 
 
+_FieldTable = Tuple[
+    Tuple[str, ...], Tuple[str, ...], Tuple[Optional[Callable[[Any], Any]], ...]
+]
+
+
 @dataclass
 class VideoProbe:
     format: Dict[str, Any]
@@ -22,71 +30,120 @@ class VideoProbe:
 
 
 def probe(path: str) -> VideoProbe:
-    info = ffmpeg.probe(path)
+    return _parse_probe(ffmpeg.probe(path))
+
+
+async def probe_many(
+    paths: Iterable[str], concurrency: Optional[int] = None
+) -> List[VideoProbe]:
+    if concurrency is None:
+        concurrency = (os.cpu_count() or 1) * 2
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def probe_one(path: str) -> VideoProbe:
+        async with semaphore:
+            info = await _run_ffprobe(path)
+        return _parse_probe(info)
+
+    return list(await asyncio.gather(*[probe_one(p) for p in paths]))
+
+
+async def _run_ffprobe(path: str) -> Dict[str, Any]:
+    args = ["ffprobe", "-show_format", "-show_streams", "-of", "json", path]
+    process = await asyncio.create_subprocess_exec(
+        *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    out, err = await process.communicate()
+    if process.returncode != 0:
+        raise ffmpeg.Error("ffprobe", out, err)
+    return json.loads(out.decode("utf-8"))
+
+
+def _parse_probe(info: Dict[str, Any]) -> VideoProbe:
     format_, metadata = _parse_format(info["format"])
     streams = _parse_all_streams(info["streams"])
     return VideoProbe(format_, streams, metadata)
 
 
 def _parse_format(format_: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
-    metadata = None
-    if "tags" in format_:
-        metadata = {k: v for k, v in format_["tags"].items()}
+    metadata = format_.get("tags")
     format_ = _parse_all_fields(format_, _FORMAT_FIELDS)
     return format_, metadata
 
 
 def _parse_all_streams(streams: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    return [_parse_all_fields(s, _STREAM_FIELDS[s["codec_type"]]) for s in streams]
+    parsed = []
+    for s in streams:
+        fields = _STREAM_FIELDS.get(s.get("codec_type"))
+        if fields:
+            parsed.append(_parse_all_fields(s, fields))
+    return parsed
 
 
-def _parse_all_fields(
-    data: Dict[str, Any], fields: Iterable[ProbeField]
-) -> Dict[str, Any]:
-    return {f.label: _parse_field(data, f) for f in fields if f.name in data}
+def _parse_all_fields(data: Dict[str, Any], fields: _FieldTable) -> Dict[str, Any]:
+    parsed = {}
+    for name, label, handler in zip(*fields):
+        value = data.get(name, _MISSING)
+        if value is not _MISSING:
+            parsed[label] = handler(value) if handler else value
+    return parsed
 
 
-def _parse_field(data: Dict[str, Any], field: ProbeField) -> str:
-    value = data[field.name]
-    return field.handler(value) if field.handler else value
+def _compile_fields(fields: Iterable[ProbeField]) -> _FieldTable:
+    fields = tuple(fields)
+    names = tuple(f.name for f in fields)
+    labels = tuple(f.label for f in fields)
+    handlers = tuple(f.handler for f in fields)
+    return names, labels, handlers
 
 
+@lru_cache(maxsize=4096)
 def _parse_size(size) -> str:
     return size2human(float(size))
 
 
+@lru_cache(maxsize=4096)
 def _parse_bitrate(bitrate) -> str:
     return bitrate2human(float(bitrate))
 
 
+@lru_cache(maxsize=4096)
 def _parse_duration(duration) -> str:
     return seconds2human(float(duration))
 
 
-_FORMAT_FIELDS: List[ProbeField] = [
-    ProbeField("filename", "Filename", filename),
-    ProbeField("format_long_name", "Format name"),
-    ProbeField("size", "Size", _parse_size),
-    ProbeField("bit_rate", "Bitrate", _parse_bitrate),
-    ProbeField("nb_streams", "Streams"),
-]
-
-_STREAM_FIELDS = {
-    "video": [
-        ProbeField("codec_type", "Codec type"),
-        ProbeField("codec_long_name", "Codec name"),
-        ProbeField("width", "Width"),
-        ProbeField("height", "Height"),
-        ProbeField("r_frame_rate", "Frame rate"),
-        ProbeField("duration", "Duration", _parse_duration),
-        ProbeField("bit_rate", "Bit rate", _parse_bitrate),
-        ProbeField("nb_frames", "Number of frames"),
-    ],
-    "audio": [
-        ProbeField("codec_type", "Codec type"),
-        ProbeField("codec_long_name", "Codec name"),
-        ProbeField("sample_rate", "Sample rate"),
-        ProbeField("channels", "Channels"),
-        ProbeField("bit_rate", "Bit rate", _parse_bitrate),
-    ],
+_MISSING = object()
+
+_FORMAT_FIELDS: _FieldTable = _compile_fields(
+    (
+        ProbeField("filename", "Filename", filename),
+        ProbeField("format_long_name", "Format name"),
+        ProbeField("size", "Size", _parse_size),
+        ProbeField("bit_rate", "Bitrate", _parse_bitrate),
+        ProbeField("nb_streams", "Streams"),
+    )
+)
+
+_STREAM_FIELDS: Dict[str, _FieldTable] = {
+    "video": _compile_fields(
+        (
+            ProbeField("codec_type", "Codec type"),
+            ProbeField("codec_long_name", "Codec name"),
+            ProbeField("width", "Width"),
+            ProbeField("height", "Height"),
+            ProbeField("r_frame_rate", "Frame rate"),
+            ProbeField("duration", "Duration", _parse_duration),
+            ProbeField("bit_rate", "Bit rate", _parse_bitrate),
+            ProbeField("nb_frames", "Number of frames"),
+        )
+    ),
+    "audio": _compile_fields(
+        (
+            ProbeField("codec_type", "Codec type"),
+            ProbeField("codec_long_name", "Codec name"),
+            ProbeField("sample_rate", "Sample rate"),
+            ProbeField("channels", "Channels"),
+            ProbeField("bit_rate", "Bit rate", _parse_bitrate),
+        )
+    ),
 }
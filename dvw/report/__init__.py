@@ -1 +1,6 @@
-from dvw.report.report import HtmlReport
+def __getattr__(name: str):
+    if name == "HtmlReport":
+        from dvw.report.report import HtmlReport
+
+        return HtmlReport
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,25 +1,60 @@
+from concurrent.futures import ProcessPoolExecutor
 from itertools import product
-from typing import List, Tuple, Optional
+from typing import List, Tuple, Optional, Dict, Any
 
 from dvw.attacks import Attack
 from dvw.core import ExtractingStatistics, EmbeddingStatistics
 from dvw.core.algorithms import Algorithm
 from dvw.metrics.base import MetricValue
 from dvw.metrics.video import VideoComparator
+from dvw.metrics.watermark import WatermarkComparator
 from dvw.report import HtmlReport
 from dvw.report.config import AnalysisKit, WatermarkHolder, ClassHolder
 
 
 class BruteForce:
-    def __init__(self, kit: AnalysisKit, precision: int) -> None:
+    def __init__(
+        self, kit: AnalysisKit, precision: int, inline_video_metrics: bool = False
+    ) -> None:
         self.kit = kit
         self.precision = precision
+        self.inline_video_metrics = inline_video_metrics
+        self.video_comparator = None
+        if kit.video_metrics:
+            self.video_comparator = VideoComparator(precision, *kit.video_metrics)
+        self.watermark_comparator = None
+        if kit.watermark_metrics:
+            self.watermark_comparator = WatermarkComparator(
+                precision, *kit.watermark_metrics
+            )
 
-    def start(self, report: HtmlReport) -> None:
+    def start(self, report: HtmlReport, workers: Optional[int] = None) -> None:
         report.add_originals(self.kit.videos, self.kit.watermarks)
-        for a in self.kit.algorithms:
-            report.add_algorithm(a.class_.__name__)
-            self._brute_algorithms(a, report)
+
+        if workers == 1 or len(self.kit.algorithms) < 2:
+            for a in self.kit.algorithms:
+                self._brute_algorithm(a, report)
+            return
+
+        with ProcessPoolExecutor(workers) as executor:
+            futures = [
+                executor.submit(self._brute_forked_algorithm, a, report.fork())
+                for a in self.kit.algorithms
+            ]
+            for f in futures:
+                report.merge(f.result())
+
+    def _brute_forked_algorithm(
+        self, algorithm_holder: ClassHolder, report: HtmlReport
+    ) -> Dict[str, Any]:
+        self._brute_algorithm(algorithm_holder, report)
+        return report.data
+
+    def _brute_algorithm(
+        self, algorithm_holder: ClassHolder, report: HtmlReport
+    ) -> None:
+        report.add_algorithm(algorithm_holder.class_.__name__)
+        self._brute_algorithms(algorithm_holder, report)
 
     def _brute_algorithms(
         self, algorithm_holder: ClassHolder, report: HtmlReport
@@ -81,13 +116,22 @@ class BruteForce:
         watermark_holder: WatermarkHolder,
         algorithm: Algorithm,
     ) -> Tuple[EmbeddingStatistics, Optional[List[MetricValue]]]:
+        if self.video_comparator and self.inline_video_metrics:
+            with watermark_holder.reader() as watermark_reader:
+                statistics = algorithm.embed(
+                    input_path,
+                    output_path,
+                    watermark_reader,
+                    on_frame_pair=self.video_comparator.update,
+                )
+            return statistics, self.video_comparator.finalize()
+
         with watermark_holder.reader() as watermark_reader:
             statistics = algorithm.embed(input_path, output_path, watermark_reader)
 
         metric_values = None
-        if self.kit.video_metrics:
-            comparator = VideoComparator(self.precision, *self.kit.video_metrics)
-            metric_values = comparator.compare(input_path, output_path)
+        if self.video_comparator:
+            metric_values = self.video_comparator.compare(input_path, output_path)
 
         return statistics, metric_values
 
@@ -106,9 +150,9 @@ class BruteForce:
             )
 
         metric_values = None
-        if self.kit.watermark_metrics:
+        if self.watermark_comparator:
             metric_values = watermark_holder.compare(
-                output_path, self.precision, self.kit.watermark_metrics
+                output_path, self.watermark_comparator
             )
 
         return statistics, metric_values
@@ -1,9 +1,5 @@
 import click
 
-from dvw.report import HtmlReport
-from dvw.report.brute import BruteForce
-from dvw.report.config import config2kit
-
 
 @click.group(help="Generate report")
 def report():
@@ -24,9 +20,18 @@ def report():
     type=click.Path(),
     help="Output directory",
 )
-def start(config, output_path):
+@click.option(
+    "--inline-metrics",
+    is_flag=True,
+    help="Measure video metrics on the frames passed to the encoder while embedding",
+)
+def start(config, output_path, inline_metrics):
+    from dvw.report import HtmlReport
+    from dvw.report.brute import BruteForce
+    from dvw.report.config import config2kit
+
     precision = 4
     kit = config2kit(config)
     report_ = HtmlReport(output_path, "exp", "assets", "result.json")
-    bf = BruteForce(kit, precision)
+    bf = BruteForce(kit, precision, inline_metrics)
     bf.start(report_)
@@ -14,7 +14,7 @@ from dvw import attacks
 from dvw.attacks import FlipAxis, RotateAngle
 from dvw.core import algorithms
 from dvw.core.methods import Emphasis, WindowPosition
-from dvw.core.transforms import WaveletSubband
+from dvw.core.transforms import WaveletSubband, Precision
 from dvw.io.watermark import WatermarkType
 from dvw.metrics.video import VideoMetric
 from dvw.metrics.watermark import WatermarkComparator, WatermarkMetric
@@ -55,6 +55,9 @@ class Validator(cerberus.Validator):
     def _validate_type_emphasis(self, x):
         return self.__validate_enums(x, Emphasis)
 
+    def _validate_type_precision(self, x):
+        return self.__validate_enums(x, Precision)
+
     def _validate_type_vidmetric(self, x):
         return self.__validate_enums(x, VideoMetric)
 
@@ -141,6 +144,9 @@ class Validator(cerberus.Validator):
     def _normalize_coerce_emphasis(self, x):
         return self._normalize_coerce_aslist(x, Emphasis)
 
+    def _normalize_coerce_precision(self, x):
+        return self._normalize_coerce_aslist(x, Precision)
+
     def _normalize_coerce_vidmetric(self, x):
         return self._normalize_coerce_aslist(x, VideoMetric)
 
@@ -173,8 +179,7 @@ class WatermarkHolder:
     def writer(self, path):
         return self.type.writer(path, **self.params)
 
-    def compare(self, path, precision, metrics):
-        comparator = WatermarkComparator(precision, *metrics)
+    def compare(self, path, comparator: WatermarkComparator):
         return comparator.compare(self.path, path, self.type, **self.params)
 
     @staticmethod
@@ -303,6 +308,7 @@ _SCHEMA = {
                     "position": asenum("winpos"),
                     "window-size": integers(min=3, rename="window_size"),
                     "emphasis": asenum("emphasis"),
+                    "precision": asenum("precision"),
                 },
             },
             "dwt-dct-even-odd-differential": {
@@ -316,6 +322,7 @@ _SCHEMA = {
                     "alpha": numbers(min=0),
                     "repeats": integers(min=1),
                     "emphasis": asenum("emphasis"),
+                    "precision": asenum("precision"),
                 },
             },
             "dwt-svd-mean-over-window-edges": {
@@ -327,6 +334,7 @@ _SCHEMA = {
                     "window-size": integers(min=3, rename="window_size"),
                     "alpha": numbers(min=0),
                     "emphasis": asenum("emphasis"),
+                    "precision": asenum("precision"),
                 },
             },
         },
@@ -1,3 +1,4 @@
+import copy
 import dataclasses
 import os.path
 import shutil
@@ -104,7 +105,7 @@ class ExperimentWatcher(ResourceWatcher):
         self.result_filename = result_filename
         self.result_path = os.path.join(path, result_filename)
         self.assets_id = 0
-        save_json(self.result_filename, self.data)
+        save_json(self.result_path, self.data)
 
     def add_assets(self):
         self.assets_id += 1
@@ -202,8 +203,25 @@ class HtmlReport(ResourceWatcher):
         self.data = {}
         self.source_id = 0
         self.sources = {}
+        self.persistent = True
         create_folder(path)
 
+    def fork(self) -> "HtmlReport":
+        report = copy.copy(self)
+        report.data = {}
+        report.persistent = False
+        return report
+
+    def merge(self, data: Dict[str, Any]) -> None:
+        algorithms = self.data.setdefault("algorithms", [])
+        algorithms.extend(data.get("algorithms", []))
+
+        experiments = self.data.setdefault("experiments", {})
+        for algorithm, paths in data.get("experiments", {}).items():
+            experiments.setdefault(algorithm, []).extend(paths)
+
+        self._save()
+
     def resolve_path(self, source: str) -> str:
         return self.subwatcher.resolve_path(self.sources[source])
 
@@ -238,7 +256,7 @@ class HtmlReport(ResourceWatcher):
         )
         algorithms = self.data.setdefault("algorithms", [])
         algorithms.append(name)
-        save_json(self.result_path, self.data)
+        self._save()
 
     def add_experiment(self, params: Dict[str, Any]) -> None:
         experiment_path = self.subwatcher.add_experiment(params)
@@ -247,4 +265,8 @@ class HtmlReport(ResourceWatcher):
         experiments = self.data.setdefault("experiments", {})
         experiments.setdefault(algorithm, []).append(experiment_path)
 
-        save_json(self.result_path, self.data)
+        self._save()
+
+    def _save(self) -> None:
+        if self.persistent:
+            save_json(self.result_path, self.data)
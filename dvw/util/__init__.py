@@ -4,6 +4,7 @@ from dvw.util.util import (
     tuple2list,
     aslist,
     shape2shape,
+    accelerated,
     isint,
     isfloat,
     isnum,
@@ -62,6 +62,9 @@ class Observable(ABC):
         for e in events:
             self.subscribers[e].discard(subscriber)
 
+    def subscribed(self, event) -> bool:
+        return bool(self.subscribers.get(event))
+
     def notify(self, event, **kwargs) -> None:
-        for s in self.subscribers[event]:
+        for s in self.subscribers.get(event, ()):
             s.update(event, **kwargs)
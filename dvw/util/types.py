@@ -1,4 +1,4 @@
-from typing import Tuple, Optional, Union, Literal, TypeVar
+from typing import Tuple, Optional, Union, Literal, TypeVar, Callable
 
 import numpy as np
 
@@ -7,3 +7,4 @@ T = TypeVar("T")
 Shape2d = Tuple[int, int]
 Shape2dParameters = Union[Tuple[Optional[int], Optional[int]], Literal[-1], None]
 FrameWithReturn = Union[np.ndarray, Tuple[np.ndarray, ...]]
+FramePairHandler = Callable[[np.ndarray, np.ndarray], None]
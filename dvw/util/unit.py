@@ -1,9 +1,14 @@
+import math
 from datetime import timedelta, datetime
-from typing import Iterable
+from functools import lru_cache
+from typing import Sequence
 
 _DIGITAL_SIZE_PREFIXES = ["", "K", "M", "G", "T", "P", "E", "Z", "Y"]
 _BITRATE_PREFIXES = ["", "k", "M", "G", "T"]
 
+_DIGITAL_SIZE_POWERS = [1024 ** i for i in range(len(_DIGITAL_SIZE_PREFIXES))]
+_BITRATE_POWERS = [1000 ** i for i in range(len(_BITRATE_PREFIXES))]
+
 
 def seconds2human(seconds: float) -> str:
     return str(timedelta(seconds=int(seconds)))
@@ -13,20 +18,30 @@ def timestamp2human(seconds: float) -> str:
     return str(datetime.fromtimestamp(int(seconds)))
 
 
+@lru_cache(maxsize=4096)
 def size2human(size: float, suffix: str = "B") -> str:
-    return _value2human(size, 1024, _DIGITAL_SIZE_PREFIXES, suffix)
+    return _value2human(
+        size, 1024, _DIGITAL_SIZE_PREFIXES, _DIGITAL_SIZE_POWERS, suffix
+    )
 
 
+@lru_cache(maxsize=4096)
 def bitrate2human(bitrate: float) -> str:
-    return _value2human(bitrate, 1000, _BITRATE_PREFIXES, "bit/s")
+    return _value2human(bitrate, 1000, _BITRATE_PREFIXES, _BITRATE_POWERS, "bit/s")
 
 
 def _value2human(
-    value: float, factor: int, prefixes: Iterable[str], suffix: str
+    value: float,
+    factor: int,
+    prefixes: Sequence[str],
+    powers: Sequence[int],
+    suffix: str,
 ) -> str:
-    unit = ""
-    for unit in prefixes:
-        if value < factor:
-            break
-        value /= factor
-    return f"{value:.2f} {unit}{suffix}"
+    index = 0
+    if value >= factor:
+        index = min(int(math.log(value, factor)), len(powers) - 1)
+        if value < powers[index]:
+            index -= 1
+        elif index + 1 < len(powers) and value >= powers[index + 1]:
+            index += 1
+    return f"{value / powers[index]:.2f} {prefixes[index]}{suffix}"
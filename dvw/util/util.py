@@ -2,12 +2,15 @@ import json
 import os
 from enum import Enum
 from pathlib import Path
-from typing import Union, List, Iterable, Type, Dict, Any
+from typing import Union, List, Iterable, Type, Dict, Any, Callable
 
+import cv2
 import numpy as np
 
 from dvw.util.types import Shape2d, Shape2dParameters, T
 
+_OPENCL = cv2.ocl.haveOpenCL() and cv2.ocl.useOpenCL()
+
 
 def bit2sign(b: Union[int, bool]) -> int:
     return 1 if b else -1
@@ -45,6 +48,12 @@ def shape2shape(old_shape: Shape2d, new_shape: Shape2dParameters = None) -> Shap
     return height, width
 
 
+def accelerated(fn: Callable, frame: np.ndarray, *args, **kwargs) -> np.ndarray:
+    if _OPENCL:
+        return fn(cv2.UMat(frame), *args, **kwargs).get()
+    return fn(frame, *args, **kwargs)
+
+
 def isint(x) -> bool:
     return isinstance(x, int) and not isinstance(x, bool)
 
@@ -84,7 +93,12 @@ def create_folder(*paths: str) -> str:
 
 
 def filename(path: str) -> str:
-    return os.path.split(path)[1]
+    return os.path.basename(path)
+
+
+def load_json(path: str) -> Any:
+    with open(path) as file:
+        return json.load(file)
 
 
 def save_json(path: str, data: Dict[str, Any]) -> None:
@@ -0,0 +1,117 @@
+from concurrent.futures import Future
+
+import cv2
+import numpy as np
+import pytest
+
+from dvw.core import algorithms
+from dvw.core.algorithms import DwtWindowMedian
+from dvw.core.methods import Emphasis, WindowPosition
+from dvw.core.transforms import WaveletSubband
+from dvw.io.video import VideoReader
+from dvw.io.watermark import RandomBitReader
+
+_FRAMES = 10
+
+
+class _InlineExecutor:
+    def __init__(self, workers: int) -> None:
+        self.workers = workers
+
+    def __enter__(self) -> "_InlineExecutor":
+        return self
+
+    def __exit__(self, *args) -> None:
+        pass
+
+    def submit(self, fn, *args) -> Future:
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+
+def _algorithm() -> DwtWindowMedian:
+    return DwtWindowMedian(
+        "haar",
+        1,
+        [WaveletSubband.LL],
+        WindowPosition.HORIZONTAL,
+        3,
+        Emphasis.CAPACITY,
+    )
+
+
+def _write_video(path: str) -> None:
+    rng = np.random.default_rng(0)
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 25, (48, 32))
+    for _ in range(_FRAMES):
+        writer.write(rng.integers(0, 256, (32, 48, 3), dtype=np.uint8))
+    writer.release()
+
+
+def _count_frames(path: str) -> int:
+    video = cv2.VideoCapture(path)
+    count = 0
+    while video.read()[0]:
+        count += 1
+    video.release()
+    return count
+
+
+def _estimating(frames: int):
+    class EstimatingVideoReader(VideoReader):
+        @property
+        def frames(self) -> int:
+            return frames
+
+    return EstimatingVideoReader
+
+
+@pytest.mark.parametrize("estimate", [4, 7, 10])
+@pytest.mark.parametrize("watermark_frames", [2.5, 6.5, 100])
+def test_parallel_embed_matches_embed_despite_frame_estimate(
+    monkeypatch, tmp_path, estimate, watermark_frames
+):
+    input_path = str(tmp_path / "input.avi")
+    _write_video(input_path)
+    algorithm = _algorithm()
+    with VideoReader(input_path) as video_reader:
+        capacity = algorithm._frame_capacity(video_reader.read()[1])
+    size = int(capacity * watermark_frames)
+    expected = algorithm.embed(
+        input_path, str(tmp_path / "expected.avi"), RandomBitReader(1, size), "MJPG"
+    )
+
+    concatenated = []
+    monkeypatch.setattr(algorithms, "VideoReader", _estimating(estimate))
+    monkeypatch.setattr(algorithms, "ProcessPoolExecutor", _InlineExecutor)
+    monkeypatch.setattr(
+        algorithms,
+        "concat_videos",
+        lambda paths, _: concatenated.extend(_count_frames(p) for p in paths),
+    )
+    actual = algorithm.embed_parallel(
+        input_path, str(tmp_path / "actual.avi"), RandomBitReader(1, size), "MJPG", 3
+    )
+
+    assert sum(concatenated) == _FRAMES
+    assert actual.total_frames == _FRAMES
+    assert actual.embedded == expected.embedded
+    assert actual.copied == expected.copied
+    assert actual.full_watermark == expected.full_watermark
+
+
+@pytest.mark.parametrize("estimate", [0, -1])
+def test_parallel_embed_falls_back_to_embed(monkeypatch, tmp_path, estimate):
+    input_path = str(tmp_path / "input.avi")
+    output_path = str(tmp_path / "output.avi")
+    _write_video(input_path)
+    monkeypatch.setattr(algorithms, "VideoReader", _estimating(estimate))
+    monkeypatch.setattr(algorithms, "concat_videos", None)
+
+    statistics = _algorithm().embed_parallel(
+        input_path, output_path, RandomBitReader(1, 1000), "MJPG", 3
+    )
+
+    assert _count_frames(output_path) == _FRAMES
+    assert statistics.embedded == 1000
@@ -0,0 +1,152 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+import pytest
+
+from dvw.attacks import attacks
+from dvw.attacks.attacks import (
+    CompositeAffineAttack,
+    Crop,
+    Flip,
+    FlipAxis,
+    Gaussian,
+    Resize,
+    Rotate,
+    RotateAngle,
+    SaltAndPepper,
+)
+from dvw.io.video import VideoReader
+
+
+def _frame() -> np.ndarray:
+    return np.full((32, 48, 3), 128, dtype=np.uint8)
+
+
+@pytest.mark.parametrize("attack", [Gaussian(std=10), SaltAndPepper(area=0.5)])
+def test_consecutive_calls_produce_different_noise(attack):
+    frame = _frame()
+    assert not np.array_equal(attack.handle(frame), attack.handle(frame))
+
+
+@pytest.mark.parametrize("attack", [Gaussian(std=10), SaltAndPepper(area=0.5)])
+def test_noise_does_not_follow_opencv_default_seed(attack):
+    frame = _frame()
+    cv2.setRNGSeed(0)
+    first = attack.handle(frame)
+    cv2.setRNGSeed(0)
+    assert not np.array_equal(first, attack.handle(frame))
+
+
+@pytest.mark.parametrize("attack", [Gaussian(std=10), SaltAndPepper(area=0.5)])
+def test_segment_seeds_drive_noise(attack):
+    frame = _frame()
+    attacks._reseed(1)
+    first = attack.handle(frame)
+    attacks._reseed(2)
+    second = attack.handle(frame)
+    attacks._reseed(1)
+    repeated = attack.handle(frame)
+
+    assert np.array_equal(first, repeated)
+    assert not np.array_equal(first, second)
+
+
+def _sequential(chain, frame: np.ndarray) -> np.ndarray:
+    for a in chain:
+        frame = a.handle(frame)
+    return frame
+
+
+@pytest.mark.parametrize(
+    "chain, tolerance",
+    [
+        ((Flip(FlipAxis.BOTH), Rotate(RotateAngle.ROTATE_90_CLOCKWISE)), 0),
+        ((Crop(10, 20, 50, 80), Flip(FlipAxis.HORIZONTAL)), 0),
+        ((Rotate(RotateAngle.ROTATE_180), Crop(5, 7, 41, 63)), 0),
+        ((Crop(10, 20, 50, 80), Resize(160, 100)), 1),
+        ((Crop(3, 4, 61, 97), Crop(2, 1, 40, 70), Resize(35, 24)), 1),
+        ((Resize(120, 80), Crop(9, 11, 50, 60), Resize(90, 70)), 2),
+        (
+            (
+                Flip(FlipAxis.VERTICAL),
+                Crop(10, 20, 50, 80),
+                Rotate(RotateAngle.ROTATE_90_COUNTERCLOCKWISE),
+                Resize(57, 31),
+            ),
+            1,
+        ),
+    ],
+)
+def test_composite_matches_sequential_chain(chain, tolerance):
+    frame = np.random.default_rng(0).integers(0, 256, (90, 160, 3), dtype=np.uint8)
+    expected = _sequential(chain, frame)
+    composite = CompositeAffineAttack(*chain)
+    actual = composite.handle(frame)
+
+    assert actual.shape == expected.shape
+    assert composite.output_shape(frame.shape[:2]) == expected.shape[:2]
+    difference = np.abs(actual.astype(np.int16) - expected)
+    assert difference.max() <= tolerance
+
+
+def _write_video(path: str, frames: int) -> None:
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 25, (48, 32))
+    for i in range(frames):
+        writer.write(np.full((32, 48, 3), i * 10, dtype=np.uint8))
+    writer.release()
+
+
+def _count_frames(path: str) -> int:
+    video = cv2.VideoCapture(path)
+    count = 0
+    while video.read()[0]:
+        count += 1
+    video.release()
+    return count
+
+
+def _estimating(frames: int):
+    class EstimatingVideoReader(VideoReader):
+        @property
+        def frames(self) -> int:
+            return frames
+
+    return EstimatingVideoReader
+
+
+@pytest.mark.parametrize("estimate", [3, 7, 10])
+def test_parallel_attack_reads_last_segment_to_eof(monkeypatch, tmp_path, estimate):
+    input_path = str(tmp_path / "input.avi")
+    _write_video(input_path, 10)
+    concatenated = []
+    monkeypatch.setattr(attacks, "VideoReader", _estimating(estimate))
+    monkeypatch.setattr(attacks, "ProcessPoolExecutor", ThreadPoolExecutor)
+    monkeypatch.setattr(
+        attacks,
+        "concat_videos",
+        lambda paths, _: concatenated.extend(_count_frames(p) for p in paths),
+    )
+
+    attacks.attack_video_parallel(
+        Flip(FlipAxis.BOTH), input_path, str(tmp_path / "output.avi"), "MJPG", 25, 3
+    )
+
+    assert sum(concatenated) == 10
+
+
+@pytest.mark.parametrize("estimate, workers", [(0, 3), (-1, 3), (10, 1)])
+def test_parallel_attack_falls_back_to_sequential(
+    monkeypatch, tmp_path, estimate, workers
+):
+    input_path = str(tmp_path / "input.avi")
+    output_path = str(tmp_path / "output.avi")
+    _write_video(input_path, 10)
+    monkeypatch.setattr(attacks, "VideoReader", _estimating(estimate))
+    monkeypatch.setattr(attacks, "concat_videos", None)
+
+    attacks.attack_video_parallel(
+        Flip(FlipAxis.BOTH), input_path, output_path, "MJPG", 25, workers
+    )
+
+    assert _count_frames(output_path) == 10
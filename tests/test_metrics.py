@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from dvw.metrics.watermark import WatermarkMetric
+
+
+def _nc(watermark1, watermark2) -> float:
+    return WatermarkMetric.NC.calculate(watermark1, watermark2, 6).values
+
+
+def _reference_nc(a, b) -> float:
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    a = (a - np.mean(a)) / (np.std(a) * len(a))
+    b = (b - np.mean(b)) / np.std(b)
+    return float(np.correlate(a, b)[0])
+
+
+def test_nc_matches_lag_zero_correlation_for_equal_lengths():
+    rng = np.random.default_rng(0)
+    a = rng.integers(0, 2, 4096)
+    b = np.where(rng.random(4096) < 0.1, 1 - a, a)
+    assert _nc(a, b) == pytest.approx(_reference_nc(a, b), abs=1e-5)
+
+
+@pytest.mark.parametrize("extra", [1, 100, 4096])
+def test_nc_aligns_unequal_lengths_on_common_prefix(extra):
+    rng = np.random.default_rng(1)
+    a = rng.integers(0, 2, 4096)
+    b = np.concatenate([a, rng.integers(0, 2, extra)])
+
+    assert _nc(a, b) == pytest.approx(1, abs=1e-5)
+    assert _nc(b, a) == pytest.approx(1, abs=1e-5)
+    assert _nc(a, b) == pytest.approx(_reference_nc(a, b[: a.size]), abs=1e-5)
@@ -0,0 +1,60 @@
+import math
+import os
+
+import cv2
+import numpy as np
+import pytest
+from skimage.metrics import structural_similarity
+
+from dvw.metrics.video import ssim, VideoComparator, VideoMetric
+
+_SAMPLE = os.path.join(
+    os.path.dirname(__file__), "..", "samples", "SampleVideo_360x240.mp4"
+)
+
+
+def _sample_frames(count: int = 3):
+    video = cv2.VideoCapture(_SAMPLE)
+    frames = []
+    while len(frames) < count:
+        success, frame = video.read()
+        if not success:
+            break
+        frames.append(frame)
+    video.release()
+    return frames
+
+
+def _distortions(frame: np.ndarray):
+    rng = np.random.default_rng(0)
+    noise = rng.normal(0, 8, frame.shape)
+    yield np.clip(frame + noise, 0, 255).astype(np.uint8)
+    yield cv2.GaussianBlur(frame, (5, 5), 1.5)
+    yield cv2.flip(frame, 1)
+    yield frame.copy()
+
+
+@pytest.mark.parametrize("index", range(3))
+def test_ssim_matches_skimage_on_sample_frames(index):
+    frame = _sample_frames()[index]
+    for distorted in _distortions(frame):
+        expected = structural_similarity(frame, distorted, channel_axis=2)
+        assert ssim(frame, distorted) == pytest.approx(expected, abs=1e-6)
+
+
+@pytest.mark.parametrize("shape", [(16, 16, 3), (33, 47, 3), (120, 90, 3)])
+def test_ssim_matches_skimage_on_random_frames(shape):
+    rng = np.random.default_rng(sum(shape))
+    frame1 = rng.integers(0, 256, shape, dtype=np.uint8)
+    frame2 = rng.integers(0, 256, shape, dtype=np.uint8)
+    expected = structural_similarity(frame1, frame2, channel_axis=2)
+    assert ssim(frame1, frame2) == pytest.approx(expected, abs=1e-6)
+
+
+def test_comparator_without_frames_returns_nan(tmp_path):
+    comparator = VideoComparator(4)
+    missing = str(tmp_path / "missing.mp4")
+
+    for values in (comparator.finalize(), comparator.compare(missing, missing)):
+        assert [v.metric for v in values] == list(VideoMetric)
+        assert all(math.isnan(v.values) for v in values)
@@ -0,0 +1,85 @@
+import io
+
+import ffmpeg
+import numpy as np
+import pytest
+
+from dvw.io import video
+from dvw.io.video import FFmpegVideoWriter, BackgroundVideoWriter
+
+
+class _BrokenPipe(io.BytesIO):
+    def write(self, data):
+        raise BrokenPipeError
+
+
+def _fake_popen(returncode: int, output: bytes, broken: bool = False):
+    class FakeProcess:
+        def __init__(self, args, stdin, stderr) -> None:
+            self.args = args
+            self.stdin = _BrokenPipe() if broken else io.BytesIO()
+            stderr.write(output)
+
+        def wait(self) -> int:
+            return returncode
+
+    return FakeProcess
+
+
+def _writer(monkeypatch, *args, size=(4, 2), **kwargs) -> FFmpegVideoWriter:
+    monkeypatch.setattr(video.subprocess, "Popen", _fake_popen(*args, **kwargs))
+    return FFmpegVideoWriter("out.mp4", "h264_nvenc", 25, size)
+
+
+def _frame() -> np.ndarray:
+    return np.zeros((2, 4, 3), dtype=np.uint8)
+
+
+def test_release_succeeds_on_zero_exit(monkeypatch):
+    writer = _writer(monkeypatch, 0, b"")
+    writer.write(_frame())
+    writer.release()
+    assert "h264_nvenc" in writer.process.args
+
+
+def test_release_raises_with_stderr_on_nonzero_exit(monkeypatch):
+    writer = _writer(monkeypatch, 1, b"Unknown encoder 'h264_nvenc'")
+    writer.write(_frame())
+    with pytest.raises(ffmpeg.Error) as error:
+        writer.release()
+    assert b"h264_nvenc" in error.value.stderr
+    assert "Unknown encoder" in str(error.value)
+
+
+def test_write_raises_with_stderr_on_broken_pipe(monkeypatch):
+    writer = _writer(monkeypatch, 1, b"Conversion failed!", broken=True)
+    with pytest.raises(ffmpeg.Error) as error:
+        writer.write(_frame())
+    assert error.value.stderr == b"Conversion failed!"
+
+
+def test_background_writer_reports_encoder_failure(monkeypatch):
+    writer = BackgroundVideoWriter(_writer(monkeypatch, 1, b"boom", broken=True))
+    writer.write(_frame())
+    with pytest.raises(ffmpeg.Error) as error:
+        writer.release()
+    assert error.value.stderr == b"boom"
+
+
+def _output_args(writer: FFmpegVideoWriter) -> list:
+    args = writer.process.args
+    return args[args.index("pipe:") + 1 :]
+
+
+def test_even_size_is_encoded_as_yuv420p(monkeypatch):
+    writer = _writer(monkeypatch, 0, b"")
+    writer.release()
+    assert "yuv420p" in _output_args(writer)
+
+
+@pytest.mark.parametrize("size", [(33, 20), (32, 21), (33, 21)])
+def test_odd_size_leaves_pixel_format_to_ffmpeg(monkeypatch, size):
+    writer = _writer(monkeypatch, 0, b"", size=size)
+    writer.write(np.zeros((size[1], size[0], 3), dtype=np.uint8))
+    writer.release()
+    assert "-pix_fmt" not in _output_args(writer)